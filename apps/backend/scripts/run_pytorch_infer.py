@@ -2,12 +2,17 @@
 """
 Run PyTorch inference on a video clip
 Usage: python run_pytorch_infer.py --clip <path> [--landmarks <json>]
+       python run_pytorch_infer.py --serve   (JSON-lines on stdin/stdout, model stays loaded)
 """
 
 import argparse
 import json
 import sys
 import os
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import torch
 import numpy as np
 from pathlib import Path
@@ -19,6 +24,25 @@ try:
 except ImportError:
     ONNX_AVAILABLE = False
 
+# OpenCV is needed to decode clips
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+# ImageNet statistics, same defaults as training/datasets/transforms.py
+NORM_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+NORM_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+MODELS_DIR = Path(__file__).parent.parent.parent / 'models'
+# Gaps at least this many frames long are crossed with a keyframe seek instead of grab(),
+# same as ml/training/datasets/video_io.py
+SEEK_THRESHOLD = 120
+
+# Optional JSON next to the model: {"num_frames": 32, "size": 224, "mean": [...], "std": [...]}
+PREPROCESS_CONFIG_NAME = 'preprocess_config.json'
+
 # Default class names (can be overridden by model config)
 DEFAULT_CLASS_NAMES = [
     'Hello', 'Thank You', 'Yes', 'No', 'Please',
@@ -27,7 +51,7 @@ DEFAULT_CLASS_NAMES = [
 
 def check_model_availability() -> tuple[str | None, str]:
     """Check if a model is available (TorchScript or ONNX)"""
-    models_dir = Path(__file__).parent.parent.parent / 'models'
+    models_dir = MODELS_DIR
     
     # Check for ONNX models
     onnx_files = list(models_dir.glob('*.onnx'))
@@ -69,69 +93,509 @@ def load_torchscript_model(model_path: str, device: str = 'cpu'):
     model.eval()
     return model
 
-def preprocess_clip(clip_path: str, num_frames: int = 32) -> np.ndarray:
+def sample_frame_indices(total_frames: int, num_frames: int) -> np.ndarray:
+    """Uniform temporal sampling, same rule as uniform_frame_indices in training/datasets/transforms.py"""
+    if total_frames <= num_frames:
+        # Short clip: take every frame and repeat the last one
+        indices = np.arange(total_frames)
+        return np.concatenate([indices, np.full(num_frames - total_frames, total_frames - 1)]).astype(int)
+    return np.linspace(0, total_frames - 1, num_frames, dtype=int)
+
+def count_frames(cap) -> int:
+    """Frame count from the container, or by grabbing through the stream when unknown (e.g. MediaRecorder webm)"""
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    if total > 0:
+        return total
+    total = 0
+    while cap.grab():
+        total += 1
+    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+    return total
+
+def resize_short_side_crop(frame: np.ndarray, size: int) -> np.ndarray:
+    """Resize shorter side to `size`, then center crop to (size, size), sized like Resize + CenterCrop"""
+    h, w = frame.shape[:2]
+    if h <= w:
+        new_h, new_w = size, int(size * w / h)
+    else:
+        new_h, new_w = int(size * h / w), size
+    frame = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    top, left = int(round((new_h - size) / 2.0)), int(round((new_w - size) / 2.0))
+    return frame[top:top + size, left:left + size]
+
+def preprocess_clip(clip_path: str, num_frames: int = 32, size: int = 224,
+                    timings: dict | None = None,
+                    mean: np.ndarray = NORM_MEAN, std: np.ndarray = NORM_STD) -> np.ndarray:
     """
-    Preprocess video clip to tensor
-    For now, returns dummy data - in production, use OpenCV or ffmpeg-python
+    Decode and preprocess a video clip to a (1, T, 3, size, size) float32 tensor.
+
+    Only the `num_frames` uniformly sampled frames are decoded: skipped frames are
+    grabbed without being retrieved/converted (gaps of SEEK_THRESHOLD frames or
+    more use one keyframe seek), and at most T resized uint8 frames are held in
+    memory. Normalization is a single vectorized pass into a preallocated output
+    buffer. If `timings` is given, decode_ms and resize_ms are written into it.
     """
-    # TODO: Implement actual video preprocessing
-    # This would use cv2 or ffmpeg to extract frames
-    # For now, return dummy input
-    return np.random.randn(1, num_frames, 3, 224, 224).astype(np.float32)
+    if not CV2_AVAILABLE:
+        raise ImportError('opencv-python not installed. Run: pip install opencv-python')
+
+    cap = cv2.VideoCapture(clip_path)
+    if not cap.isOpened():
+        raise RuntimeError(f'Cannot open clip: {clip_path}')
+
+    decode_s = 0.0
+    resize_s = 0.0
+    frames = np.empty((num_frames, size, size, 3), dtype=np.uint8)
+    filled = 0
+    try:
+        start = time.perf_counter()
+        total = count_frames(cap)
+        if total == 0:
+            raise RuntimeError(f'No frames decoded from clip: {clip_path}')
+        indices = sample_frame_indices(total, num_frames)
+        decode_s += time.perf_counter() - start
 
-def predict_onnx(session: ort.InferenceSession, clip_tensor: np.ndarray) -> tuple[str, float]:
-    """Run inference with ONNX model"""
+        position = 0
+        for slot, target in enumerate(indices):
+            if slot > 0 and target == indices[slot - 1]:
+                frames[slot] = frames[slot - 1]
+                filled += 1
+                continue
+
+            start = time.perf_counter()
+            if target - position >= SEEK_THRESHOLD:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, int(target))
+                position = target
+            while position < target and cap.grab():
+                position += 1
+            ok, frame = cap.read()
+            position += 1
+            decode_s += time.perf_counter() - start
+            if not ok:
+                break
+
+            start = time.perf_counter()
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            frames[slot] = resize_short_side_crop(frame, size)
+            resize_s += time.perf_counter() - start
+            filled += 1
+    finally:
+        cap.release()
+
+    if filled == 0:
+        raise RuntimeError(f'No frames decoded from clip: {clip_path}')
+    if filled < num_frames:
+        # Container over-reported its frame count; repeat the last decoded frame
+        frames[filled:] = frames[filled - 1]
+
+    start = time.perf_counter()
+    clip = np.empty((1, num_frames, 3, size, size), dtype=np.float32)
+    np.multiply(frames.transpose(0, 3, 1, 2), np.float32(1.0 / 255.0), out=clip[0], dtype=np.float32)
+    clip -= mean[None, None, :, None, None]
+    clip /= std[None, None, :, None, None]
+    resize_s += time.perf_counter() - start
+
+    if timings is not None:
+        timings['decode_ms'] = round(decode_s * 1000, 2)
+        timings['resize_ms'] = round(resize_s * 1000, 2)
+    return clip
+
+def decode_predictions(logits: torch.Tensor, class_names: list[str]) -> list[tuple[str, float]]:
+    """Softmax + argmax per batch row -> [(label, confidence), ...]"""
+    probabilities = torch.nn.functional.softmax(logits, dim=1)
+    confidence, predicted_idx = torch.max(probabilities, 1)
+
+    results = []
+    for conf, idx in zip(confidence.tolist(), predicted_idx.tolist()):
+        label = class_names[idx] if idx < len(class_names) else f'Sign_{idx}'
+        results.append((label, conf))
+    return results
+
+def predict_onnx(session: 'ort.InferenceSession', clip_tensor: np.ndarray,
+                 class_names: list[str] = DEFAULT_CLASS_NAMES) -> list[tuple[str, float]]:
+    """Run inference with ONNX model; one (label, confidence) per batch row"""
     input_name = session.get_inputs()[0].name
     output = session.run(None, {input_name: clip_tensor})
     logits = output[0]
-    
-    probabilities = torch.nn.functional.softmax(torch.tensor(logits), dim=1)
-    confidence, predicted_idx = torch.max(probabilities, 1)
-    
-    # Load class names
-    class_names = DEFAULT_CLASS_NAMES
-    class_names_file = Path(session.model_path).parent / 'class_names.txt'
-    if class_names_file.exists():
-        with open(class_names_file, 'r') as f:
-            class_names = [line.strip() for line in f if line.strip()]
-    
-    label = class_names[predicted_idx.item()] if predicted_idx.item() < len(class_names) else f'Sign_{predicted_idx.item()}'
-    confidence_val = confidence.item()
-    
-    return label, confidence_val
+    return decode_predictions(torch.from_numpy(logits), class_names)
 
-def predict_torchscript(model: torch.jit.ScriptModule, clip_tensor: torch.Tensor) -> tuple[str, float]:
-    """Run inference with TorchScript model"""
+def predict_torchscript(model: torch.jit.ScriptModule, clip_tensor: torch.Tensor,
+                        class_names: list[str] = DEFAULT_CLASS_NAMES) -> list[tuple[str, float]]:
+    """Run inference with TorchScript model; one (label, confidence) per batch row"""
     with torch.no_grad():
         output = model(clip_tensor)
-        probabilities = torch.nn.functional.softmax(output, dim=1)
-        confidence, predicted_idx = torch.max(probabilities, 1)
-    
-    # Load class names
-    class_names = DEFAULT_CLASS_NAMES
-    class_names_file = Path(model.__file__ if hasattr(model, '__file__') else '').parent / 'class_names.txt'
-    if not class_names_file.exists():
-        class_names_file = Path(__file__).parent.parent.parent / 'models' / 'class_names.txt'
-    
-    if class_names_file.exists():
-        with open(class_names_file, 'r') as f:
-            class_names = [line.strip() for line in f if line.strip()]
-    
-    label = class_names[predicted_idx.item()] if predicted_idx.item() < len(class_names) else f'Sign_{predicted_idx.item()}'
-    confidence_val = confidence.item()
-    
-    return label, confidence_val
+    return decode_predictions(output.cpu(), class_names)
+
+def read_class_names(model_path: str) -> tuple[list[str], Path | None]:
+    """class_names.txt next to the model, then in models/; falls back to DEFAULT_CLASS_NAMES"""
+    for candidate in (Path(model_path).parent / 'class_names.txt', MODELS_DIR / 'class_names.txt'):
+        if candidate.exists():
+            with open(candidate, 'r') as f:
+                names = [line.strip() for line in f if line.strip()]
+            if names:
+                return names, candidate
+    return DEFAULT_CLASS_NAMES, None
+
+class ModelRegistry:
+    """
+    Owns the loaded model and its metadata: class names, input shape and
+    preprocessing config (num_frames, size, mean, std).
+
+    Everything is read once; `refresh()` re-stats the model file, class_names.txt,
+    preprocess_config.json and the models directory (at most every
+    `check_interval` seconds) and reloads only when something changed on disk.
+    """
+
+    def __init__(self, device: str = 'cpu', check_interval: float = 2.0):
+        self.requested_device = device
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        self.model = None
+        self.model_path = None
+        self.model_type = 'none'
+        self.device = 'cpu'
+        self.class_names = DEFAULT_CLASS_NAMES
+        self.input_shape = None
+        # True when the model only takes one batch size (fixed ONNX batch dim, or a batched pass failed on shape)
+        self.fixed_batch = False
+        self.preprocess = {}
+        self.load_ms = 0.0
+        self._watched = {}
+        self._last_check = 0.0
+
+    def load(self):
+        """(Re)discover and load the model and all its metadata"""
+        model_path, model_type = check_model_availability()
+        if not model_path or model_type == 'none':
+            raise FileNotFoundError('No model found. Please download and convert a pretrained model.')
+
+        start = time.perf_counter()
+        if model_type == 'onnx':
+            model, device = load_onnx_model(model_path), 'cpu'
+            input_shape = list(model.get_inputs()[0].shape)
+        elif model_type == 'torchscript':
+            device = 'cuda' if self.requested_device == 'cuda' and torch.cuda.is_available() else 'cpu'
+            model, input_shape = load_torchscript_model(model_path, device), None
+        else:
+            raise ValueError(f'Unknown model type: {model_type}')
+
+        class_names, class_names_file = read_class_names(model_path)
+        preprocess, config_file = self._read_preprocess_config(model_path, input_shape)
+
+        self.model, self.model_path, self.model_type, self.device = model, model_path, model_type, device
+        self.class_names = class_names
+        self.input_shape = input_shape
+        self.fixed_batch = bool(input_shape) and isinstance(input_shape[0], int)
+        self.preprocess = preprocess
+        self.load_ms = round((time.perf_counter() - start) * 1000, 2)
+        self._watched = {
+            path: self._mtime(path)
+            for path in (MODELS_DIR, Path(model_path), class_names_file, config_file,
+                         MODELS_DIR / 'AVAILABLE_VIDEO_MODEL.txt')
+            if path is not None
+        }
+        self._last_check = time.monotonic()
+
+    def refresh(self) -> bool:
+        """Reload if any watched file changed since the last load; returns True if reloaded"""
+        with self.lock:
+            if self.model is not None and time.monotonic() - self._last_check < self.check_interval:
+                return False
+            self._last_check = time.monotonic()
+            if self.model is not None and all(self._mtime(p) == m for p, m in self._watched.items()):
+                return False
+            if self.model is None:
+                self.load()
+                return True
+            try:
+                self.load()
+            except Exception as e:
+                # Half-written or removed files: keep serving the model we already have
+                print(f'Model reload failed, keeping {self.model_path}: {e}', file=sys.stderr)
+                return False
+            return True
+
+    @staticmethod
+    def _mtime(path: Path) -> float | None:
+        try:
+            return path.stat().st_mtime
+        except OSError:
+            return None
+
+    @staticmethod
+    def _read_preprocess_config(model_path: str, input_shape: list | None) -> tuple[dict, Path]:
+        config = {'num_frames': 32, 'size': 224, 'mean': NORM_MEAN, 'std': NORM_STD}
+        # Static dims of an ONNX input (B, T, C, H, W) win over the defaults
+        if input_shape and len(input_shape) == 5:
+            if isinstance(input_shape[1], int):
+                config['num_frames'] = input_shape[1]
+            if isinstance(input_shape[3], int):
+                config['size'] = input_shape[3]
+
+        config_file = Path(model_path).parent / PREPROCESS_CONFIG_NAME
+        if config_file.exists():
+            with open(config_file, 'r') as f:
+                overrides = json.load(f)
+            for key in ('num_frames', 'size'):
+                if key in overrides:
+                    config[key] = int(overrides[key])
+            for key in ('mean', 'std'):
+                if key in overrides:
+                    config[key] = np.asarray(overrides[key], dtype=np.float32)
+        return config, config_file
+
+    def preprocess_clip(self, clip_path: str, num_frames: int | None = None,
+                        timings: dict | None = None) -> np.ndarray:
+        """preprocess_clip() with this model's config"""
+        config = self.preprocess
+        return preprocess_clip(clip_path, num_frames or config['num_frames'], config['size'],
+                               timings=timings, mean=config['mean'], std=config['std'])
+
+    def predict(self, clip_tensor: np.ndarray) -> list[tuple[str, float]]:
+        """Run the loaded model on a (B, T, 3, H, W) batch of preprocessed clips"""
+        if self.model_type == 'onnx':
+            return predict_onnx(self.model, clip_tensor, self.class_names)
+        clip_torch = torch.from_numpy(clip_tensor)
+        if self.device == 'cuda':
+            clip_torch = clip_torch.cuda()
+        return predict_torchscript(self.model, clip_torch, self.class_names)
+
+def build_result(label: str, confidence: float, model_type: str, model_path: str, timings: dict) -> dict:
+    """Result payload shared by the one-shot and worker modes"""
+    return {
+        'label': label,
+        'confidence': float(confidence),
+        'model': f'videoswin-local-{model_type}',
+        'details': {
+            'model_path': model_path,
+            'model_type': model_type,
+            'timings': timings
+        }
+    }
+
+def run_clip(registry: ModelRegistry, clip_path: str, num_frames: int | None = None) -> dict:
+    """Preprocess a clip and run inference with an already-loaded model"""
+    timings = {}
+    clip_tensor = registry.preprocess_clip(clip_path, num_frames, timings=timings)
+    start = time.perf_counter()
+    label, confidence = registry.predict(clip_tensor)[0]
+    timings['forward_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    return build_result(label, confidence, registry.model_type, registry.model_path, timings)
+
+# Errors a batched forward pass raises when the model was exported with a fixed batch size
+BATCH_SHAPE_ERRORS = (
+    'invalid dimensions for input',  # onnxruntime
+    'must match the size of tensor',  # torch broadcasting
+    'is invalid for input of size',  # torch view/reshape
+    'size mismatch',
+    'shape mismatch'
+)
+
+def is_batch_shape_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return any(pattern in message for pattern in BATCH_SHAPE_ERRORS)
+
+class MicroBatcher:
+    """
+    Coalesces concurrent clip requests into a single forward pass.
+
+    Clips are preprocessed on a small thread pool (OpenCV releases the GIL) and
+    queued. The batching thread takes the first queued clip, then waits up to
+    `max_wait_us` for more, up to `max_batch_size`, runs one forward pass per
+    clip shape and fans the results back out through `emit`.
+    """
+
+    def __init__(self, registry: ModelRegistry, emit,
+                 max_batch_size: int = 8, max_wait_us: int = 2000, preprocess_workers: int = 2):
+        self.registry = registry
+        self.emit = emit
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_s = max(0, max_wait_us) / 1e6
+        self.queue = queue.Queue()
+        self.pool = ThreadPoolExecutor(max_workers=max(1, preprocess_workers))
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, request_id, clip_path: str, num_frames: int | None = None):
+        """Preprocess a clip in the background, then queue it for batching"""
+        received = time.perf_counter()
+
+        def _preprocess():
+            try:
+                timings = {}
+                clip_tensor = self.registry.preprocess_clip(clip_path, num_frames, timings=timings)
+                self.queue.put((request_id, clip_tensor, timings, received))
+            except Exception as e:
+                self.emit({'id': request_id, 'error': str(e), 'label': 'unknown', 'confidence': 0.0})
+
+        self.pool.submit(_preprocess)
+
+    def close(self):
+        """Finish outstanding requests and stop the batching thread"""
+        self.pool.shutdown(wait=True)
+        self.queue.put(None)
+        self.thread.join()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            batch = [item]
+            closing = False
+            deadline = time.perf_counter() + self.max_wait_s
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+
+            # Clips with different frame counts cannot share a tensor
+            groups = {}
+            for entry in batch:
+                groups.setdefault(entry[1].shape, []).append(entry)
+            for entries in groups.values():
+                self._run_batch(entries)
+
+            if closing:
+                return
+
+    def _predict(self, entries: list) -> list[tuple[str, float]]:
+        registry = self.registry
+        if len(entries) == 1:
+            return registry.predict(entries[0][1])
+        if registry.fixed_batch:
+            return [registry.predict(entry[1])[0] for entry in entries]
+        try:
+            return registry.predict(np.concatenate([entry[1] for entry in entries], axis=0))
+        except Exception as e:
+            if not is_batch_shape_error(e):
+                raise
+            # Model exported with a fixed batch size: one clip per pass until the next reload
+            registry.fixed_batch = True
+            return [registry.predict(entry[1])[0] for entry in entries]
+
+    def _emit_errors(self, entries: list, error: Exception):
+        for request_id, _, _, _ in entries:
+            self.emit({'id': request_id, 'error': str(error), 'label': 'unknown', 'confidence': 0.0})
+
+    def _run_batch(self, entries: list):
+        registry = self.registry
+        try:
+            registry.refresh()
+        except Exception as e:
+            self._emit_errors(entries, e)
+            return
+
+        # Timed after refresh(), so a model reload is not reported as forward time
+        start = time.perf_counter()
+        try:
+            predictions = self._predict(entries)
+        except Exception as e:
+            self._emit_errors(entries, e)
+            return
+        forward_ms = round((time.perf_counter() - start) * 1000, 2)
+
+        done = time.perf_counter()
+        for (request_id, _, timings, received), (label, confidence) in zip(entries, predictions):
+            timings['forward_ms'] = forward_ms
+            result = build_result(label, confidence, registry.model_type, registry.model_path, timings)
+            result['details']['batch_size'] = len(entries)
+            result['details']['infer_ms'] = round((done - received) * 1000, 2)
+            result['id'] = request_id
+            self.emit(result)
+
+def serve(args) -> int:
+    """
+    Long-lived worker mode: load the model once and answer clip requests.
+    Reads one JSON object per line on stdin:  {"id": ..., "clip": "<path>", "num_frames": 32}
+    Writes one JSON object per line on stdout, echoing "id" (responses may arrive out of order).
+    The first line written is a readiness message: {"ready": true, ...}
+    """
+    registry = ModelRegistry(args.device)
+    try:
+        registry.load()
+    except FileNotFoundError as e:
+        print(json.dumps({
+            'ready': False,
+            'error': str(e),
+            'message': 'See /api/models/download-help for instructions'
+        }), flush=True)
+        return 1
+    except Exception as e:
+        print(json.dumps({'ready': False, 'error': str(e)}), flush=True)
+        return 1
+
+    write_lock = threading.Lock()
+
+    def emit(message: dict):
+        with write_lock:
+            print(json.dumps(message), flush=True)
+
+    batcher = MicroBatcher(
+        registry, emit,
+        max_batch_size=args.max_batch_size,
+        max_wait_us=args.max_wait_us,
+        preprocess_workers=args.preprocess_workers
+    )
+
+    emit({
+        'ready': True,
+        'model': f'videoswin-local-{registry.model_type}',
+        'model_path': registry.model_path,
+        'load_ms': registry.load_ms,
+        'max_batch_size': args.max_batch_size
+    })
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            clip_path = request.get('clip')
+            if not clip_path or not os.path.exists(clip_path):
+                raise FileNotFoundError(f'Clip not found: {clip_path}')
+            num_frames = request.get('num_frames', args.num_frames)
+            batcher.submit(request_id, clip_path, int(num_frames) if num_frames else None)
+        except Exception as e:
+            emit({'id': request_id, 'error': str(e), 'label': 'unknown', 'confidence': 0.0})
+
+    batcher.close()
+    return 0
 
 def main():
     parser = argparse.ArgumentParser(description='Run inference on video clip')
-    parser.add_argument('--clip', required=True, help='Path to video clip')
+    parser.add_argument('--clip', help='Path to video clip')
     parser.add_argument('--landmarks', help='JSON string of landmarks array')
     parser.add_argument('--num-classes', type=int, default=10, help='Number of sign classes')
-    parser.add_argument('--num-frames', type=int, default=32, help='Number of frames in clip')
+    parser.add_argument('--num-frames', type=int, default=None,
+                        help='Number of frames in clip (default: from the model input shape / preprocess_config.json, else 32)')
     parser.add_argument('--device', default='cpu', choices=['cpu', 'cuda'], help='Device to run inference on')
+    parser.add_argument('--serve', action='store_true',
+                        help='Keep the model loaded and read JSON-lines requests from stdin')
+    parser.add_argument('--max-batch-size', type=int, default=8,
+                        help='Worker mode: max clips coalesced into one forward pass')
+    parser.add_argument('--max-wait-us', type=int, default=2000,
+                        help='Worker mode: max time to wait for more clips before running a batch (microseconds)')
+    parser.add_argument('--preprocess-workers', type=int, default=2,
+                        help='Worker mode: threads decoding clips in parallel')
     
     args = parser.parse_args()
 
+    if args.serve:
+        sys.exit(serve(args))
+
+    if not args.clip:
+        parser.error('--clip is required unless --serve is given')
+
     if not os.path.exists(args.clip):
         result = {
             'error': f'Clip not found: {args.clip}',
@@ -142,12 +606,13 @@ def main():
         sys.exit(1)
 
     try:
-        # Check for available model
-        model_path, model_type = check_model_availability()
-        
-        if not model_path or model_type == 'none':
+        # Load model (and its class names / preprocessing config)
+        registry = ModelRegistry(args.device)
+        try:
+            registry.load()
+        except FileNotFoundError as e:
             result = {
-                'error': 'No model found. Please download and convert a pretrained model.',
+                'error': str(e),
                 'message': 'See /api/models/download-help for instructions',
                 'label': 'unknown',
                 'confidence': 0.0,
@@ -156,33 +621,7 @@ def main():
             print(json.dumps(result))
             sys.exit(1)
         
-        # Preprocess clip
-        clip_tensor = preprocess_clip(args.clip, args.num_frames)
-        
-        # Load and run model
-        if model_type == 'onnx':
-            session = load_onnx_model(model_path, args.num_classes)
-            label, confidence = predict_onnx(session, clip_tensor)
-        elif model_type == 'torchscript':
-            device = 'cuda' if args.device == 'cuda' and torch.cuda.is_available() else 'cpu'
-            model = load_torchscript_model(model_path, device)
-            clip_torch = torch.from_numpy(clip_tensor)
-            if device == 'cuda':
-                clip_torch = clip_torch.cuda()
-                model = model.cuda()
-            label, confidence = predict_torchscript(model, clip_torch)
-        else:
-            raise ValueError(f'Unknown model type: {model_type}')
-        
-        result = {
-            'label': label,
-            'confidence': float(confidence),
-            'model': f'videoswin-local-{model_type}',
-            'details': {
-                'model_path': model_path,
-                'model_type': model_type
-            }
-        }
+        result = run_clip(registry, args.clip, args.num_frames)
         
         print(json.dumps(result))
         
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Async multi-backend router for Video-Swin inference
+
+Wraps the call_* functions in videoswin_client.py with:
+- per-backend latency stats (rolling p50/p95 over every call, failures and
+  timeouts included) and success/failure counts
+- a cap on in-flight calls per backend: calls that time out or lose a hedge
+  race keep running on their executor thread until the client returns, so a
+  slow backend is skipped once it has `max_in_flight` calls outstanding
+- a circuit breaker per backend, so a dead server is skipped instead of
+  costing a full timeout on every request
+- optional hedged requests: if the primary backend has not answered by its
+  own p95 latency, the next backend is raced against it and the first
+  success wins
+
+Usage:
+    python inference_router.py --clip clip.mp4 --hedge
+    (backends are taken from TRITON_URL, TRITON_GRPC_URL and TORCHSERVE_URL)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from videoswin_client import call_triton_rest, call_triton_grpc, call_torchserve
+
+
+class CircuitBreaker:
+    """
+    closed -> open after `failure_threshold` consecutive failures.
+    open -> half_open once `reset_timeout` seconds have passed; a single trial
+    request is let through, and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            self.trial_in_flight = False
+        if self.state == "half_open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self.trial_in_flight = False
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+class Backend:
+    """
+    One inference backend: a blocking call(clip_path) -> result dict plus its health
+
+    Outcomes are recorded from executor threads, so health state is guarded by `lock`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        call: Callable[[str], Dict[str, Any]],
+        timeout: float = 30.0,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        window: int = 200,
+        max_in_flight: int = 4
+    ):
+        self.name = name
+        self.call = call
+        self.timeout = timeout
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.latencies = deque(maxlen=window)
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.lock = threading.Lock()
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency percentile in seconds over the rolling window"""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def acquire(self) -> Optional[str]:
+        """Claim an in-flight slot; returns why the backend can't take the call, or None"""
+        with self.lock:
+            if self.in_flight >= self.max_in_flight:
+                return "saturated"
+            # Ask the breaker only when the call will really be made, so a
+            # half-open trial slot is never claimed and then left unused
+            if not self.breaker.allow():
+                return "circuit open"
+            self.in_flight += 1
+            return None
+
+    def _record(self, ok: bool, latency: float):
+        # Failures count too: leaving out slow errors and timeouts would bias p95 low
+        self.latencies.append(latency)
+        if ok:
+            self.successes += 1
+            self.breaker.record_success()
+        else:
+            self.failures += 1
+            self.breaker.record_failure()
+
+    def record(self, ok: bool, latency: float):
+        with self.lock:
+            self._record(ok, latency)
+
+    def finish(self, call: Dict[str, Any], ok: bool, latency: float, release: bool = False):
+        """
+        Record one call's outcome the first time it is known: at its timeout, or
+        when it returns. `release` frees its in-flight slot (done by the thread
+        that ran it).
+        """
+        with self.lock:
+            if release:
+                self.in_flight -= 1
+            if call["recorded"]:
+                return
+            call["recorded"] = True
+            if call.get("timed_out"):
+                self.timeouts += 1
+            self._record(ok, latency)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            p50, p95 = self.percentile(0.5), self.percentile(0.95)
+            return {
+                "state": self.breaker.state,
+                "successes": self.successes,
+                "failures": self.failures,
+                "timeouts": self.timeouts,
+                "in_flight": self.in_flight,
+                "p50_ms": round(p50 * 1000, 2) if p50 is not None else None,
+                "p95_ms": round(p95 * 1000, 2) if p95 is not None else None
+            }
+
+
+class InferenceRouter:
+    """
+    Routes a clip to the first healthy backend (in priority order), falling
+    through on failure and optionally hedging slow requests.
+    """
+
+    def __init__(self, backends: List[Backend], hedge: bool = False, min_hedge_samples: int = 20,
+                 max_workers: Optional[int] = None):
+        self.backends = backends
+        self.hedge = hedge
+        self.min_hedge_samples = min_hedge_samples
+        # One thread per in-flight slot, so an admitted call never queues behind abandoned ones
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or max(1, sum(backend.max_in_flight for backend in backends))
+        )
+
+    @staticmethod
+    def _run(backend: Backend, clip_path: str, call: Dict[str, Any]) -> Dict[str, Any]:
+        """Executor side of a call: records the real latency (unless the timeout already did) and frees the slot"""
+        start = time.perf_counter()
+        ok = False
+        try:
+            result = backend.call(clip_path)
+            ok = True
+            return result
+        finally:
+            backend.finish(call, ok, time.perf_counter() - start, release=True)
+
+    def _submit(self, backend: Backend, clip_path: str) -> asyncio.Task:
+        """Start a call on a slot claimed with backend.acquire()"""
+        call = {"recorded": False}
+        future = asyncio.get_running_loop().run_in_executor(self.executor, self._run, backend, clip_path, call)
+        return asyncio.ensure_future(self._wait(backend, future, call))
+
+    async def _wait(self, backend: Backend, future: asyncio.Future, call: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            # Threads can't be cancelled: a timeout or a lost hedge race only stops
+            # waiting, and the thread still records the outcome when the call returns
+            return await asyncio.wait_for(asyncio.shield(future), timeout=backend.timeout)
+        except asyncio.TimeoutError:
+            call["timed_out"] = True
+            backend.finish(call, False, backend.timeout)
+            raise TimeoutError(f"timed out after {backend.timeout:g}s") from None
+
+    def _hedge_delay(self, backend: Backend, started: float) -> Optional[float]:
+        if not self.hedge:
+            return None
+        with backend.lock:
+            if len(backend.latencies) < self.min_hedge_samples:
+                return None
+            p95 = backend.percentile(0.95)
+        return max(0.0, p95 - (time.perf_counter() - started))
+
+    async def infer(self, clip_path: str) -> Dict[str, Any]:
+        queue = list(self.backends)
+        pending: Dict[asyncio.Task, tuple] = {}
+        errors: Dict[str, str] = {}
+
+        def launch(hedged: bool = False) -> bool:
+            while queue:
+                backend = queue.pop(0)
+                refused = backend.acquire()
+                if refused:
+                    errors.setdefault(backend.name, refused)
+                    continue
+                task = self._submit(backend, clip_path)
+                pending[task] = (backend, time.perf_counter(), hedged)
+                return True
+            return False
+
+        launch()
+        try:
+            while pending:
+                timeout = None
+                if queue and len(pending) == 1:
+                    backend, started, _ = next(iter(pending.values()))
+                    timeout = self._hedge_delay(backend, started)
+
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Primary is past its p95: race the next backend against it
+                    launch(hedged=True)
+                    continue
+
+                for task in done:
+                    backend, _, hedged = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        errors[backend.name] = str(e)
+                        continue
+                    result.setdefault("details", {})
+                    result["details"]["backend"] = backend.name
+                    result["details"]["hedged"] = hedged
+                    return result
+
+                if not pending:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise RuntimeError(f"All inference backends failed: {errors}")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {backend.name: backend.snapshot() for backend in self.backends}
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+
+def build_router_from_env(hedge: bool = False, model_name: str = "videoswin", timeout: float = 30.0,
+                          max_in_flight: int = 4) -> InferenceRouter:
+    """Backends in priority order: Triton REST, Triton gRPC, TorchServe"""
+    backends = []
+    if os.getenv("TRITON_URL"):
+        url = os.environ["TRITON_URL"]
+        backends.append(Backend("triton-rest", lambda clip: call_triton_rest(url, clip, model_name), timeout,
+                                max_in_flight=max_in_flight))
+    if os.getenv("TRITON_GRPC_URL"):
+        grpc_url = os.environ["TRITON_GRPC_URL"]
+        backends.append(Backend("triton-grpc", lambda clip: call_triton_grpc(grpc_url, clip, model_name), timeout,
+                                max_in_flight=max_in_flight))
+    if os.getenv("TORCHSERVE_URL"):
+        torchserve_url = os.environ["TORCHSERVE_URL"]
+        backends.append(Backend("torchserve", lambda clip: call_torchserve(torchserve_url, clip, model_name), timeout,
+                                max_in_flight=max_in_flight))
+    return InferenceRouter(backends, hedge=hedge)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Route inference across Triton/TorchServe backends')
+    parser.add_argument('--clip', required=True, action='append', help='Path to video clip (repeatable)')
+    parser.add_argument('--model', default='videoswin', help='Model name')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Per-backend timeout in seconds')
+    parser.add_argument('--hedge', action='store_true', help='Send a hedged request once the primary passes its p95')
+    parser.add_argument('--max-in-flight', type=int, default=4,
+                        help='Outstanding calls per backend (abandoned calls included) before it is skipped')
+
+    args = parser.parse_args()
+
+    router = build_router_from_env(hedge=args.hedge, model_name=args.model, timeout=args.timeout,
+                                   max_in_flight=args.max_in_flight)
+    if not router.backends:
+        print(json.dumps({"error": "No backends configured. Set TRITON_URL, TRITON_GRPC_URL or TORCHSERVE_URL"}),
+              file=sys.stderr)
+        sys.exit(1)
+
+    async def run():
+        results = []
+        for clip in args.clip:
+            try:
+                results.append(await router.infer(clip))
+            except Exception as e:
+                results.append({"error": str(e), "label": "unknown", "confidence": 0.0})
+        return results
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        router.close()
+
+    print(json.dumps({"results": results, "backends": router.stats()}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -7,12 +7,10 @@ import argparse
 import json
 import requests
 import base64
+import struct
 import numpy as np
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import sys
-import grpc
-import tritonclient.http as httpclient
-from tritonclient.utils import InferenceServerException
 
 # Optional: For gRPC client
 try:
@@ -21,6 +19,316 @@ try:
 except ImportError:
     GRPC_AVAILABLE = False
 
+# Triton binary tensor extension: datatype <-> numpy dtype
+TRITON_DTYPES = {
+    "FP32": np.float32,
+    "FP16": np.float16,
+    "INT64": np.int64,
+    "INT32": np.int32,
+    "UINT8": np.uint8,
+    "BOOL": np.bool_,
+}
+
+
+def _serialize_bytes_tensor(values) -> bytes:
+    """BYTES tensor wire format: each element is a little-endian uint32 length + raw bytes"""
+    parts = []
+    for value in values:
+        if isinstance(value, str):
+            value = value.encode('utf-8')
+        parts.append(struct.pack('<I', len(value)))
+        parts.append(value)
+    return b''.join(parts)
+
+
+def _deserialize_bytes_tensor(buffer: bytes) -> np.ndarray:
+    values = []
+    offset = 0
+    while offset < len(buffer):
+        (length,) = struct.unpack_from('<I', buffer, offset)
+        offset += 4
+        values.append(buffer[offset:offset + length])
+        offset += length
+    return np.array(values, dtype=object)
+
+
+def encode_binary_request(inputs, output_names) -> tuple[bytes, int]:
+    """
+    Build a Triton binary-extension request body.
+
+    Args:
+        inputs: list of (name, datatype, shape, payload) where payload is a
+            numpy array (numeric types) or a list of bytes (BYTES)
+        output_names: outputs to request as binary data
+
+    Returns:
+        (body, json_header_length) -- send json_header_length as the
+        Inference-Header-Content-Length header
+    """
+    header_inputs = []
+    blobs = []
+    for name, datatype, shape, payload in inputs:
+        if datatype == "BYTES":
+            blob = _serialize_bytes_tensor(payload)
+        else:
+            blob = np.ascontiguousarray(payload, dtype=TRITON_DTYPES[datatype]).tobytes()
+        header_inputs.append({
+            "name": name,
+            "shape": list(shape),
+            "datatype": datatype,
+            "parameters": {"binary_data_size": len(blob)}
+        })
+        blobs.append(blob)
+
+    header = json.dumps({
+        "inputs": header_inputs,
+        "outputs": [{"name": name, "parameters": {"binary_data": True}} for name in output_names]
+    }).encode('utf-8')
+    return header + b''.join(blobs), len(header)
+
+
+def parse_binary_response(body: bytes, header_length: Optional[int]) -> tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """
+    Parse a Triton response (binary extension or plain JSON).
+
+    Returns:
+        (header, outputs) -- the JSON response header (model_name,
+        model_version, outputs with name/datatype/shape; tensor data
+        omitted) and {output_name: array}
+    """
+    if header_length is None:
+        header_length = len(body)
+    result = json.loads(body[:header_length])
+    outputs = {}
+    offset = header_length
+    for output in result.get("outputs", []):
+        datatype = output["datatype"]
+        shape = output.get("shape", [])
+        size = output.get("parameters", {}).get("binary_data_size")
+        if size is not None:
+            blob = body[offset:offset + size]
+            offset += size
+            if datatype == "BYTES":
+                array = _deserialize_bytes_tensor(blob)
+            else:
+                array = np.frombuffer(blob, dtype=TRITON_DTYPES[datatype])
+        else:
+            array = np.array(output.pop("data"), dtype=object if datatype == "BYTES" else TRITON_DTYPES[datatype])
+        outputs[output["name"]] = array.reshape(shape) if shape else array
+    return result, outputs
+
+
+def decode_binary_response(body: bytes, header_length: Optional[int]) -> Dict[str, np.ndarray]:
+    """Parse a Triton response (binary extension or plain JSON) into {output_name: array}"""
+    return parse_binary_response(body, header_length)[1]
+
+
+def _grpc_response_header(result) -> Dict[str, Any]:
+    """gRPC counterpart of the HTTP response header: model/version and output metadata without tensor bytes"""
+    response = result.get_response(as_json=True)
+    response.pop("raw_output_contents", None)
+    return response
+
+
+def _logits_to_prediction(logits: np.ndarray, class_names: Optional[List[str]]) -> tuple[str, float]:
+    logits = np.asarray(logits, dtype=np.float32).reshape(-1)
+    probabilities = np.exp(logits - logits.max())
+    probabilities /= probabilities.sum()
+    idx = int(probabilities.argmax())
+    label = class_names[idx] if class_names and idx < len(class_names) else f"Sign_{idx}"
+    return label, float(probabilities[idx])
+
+
+class TritonClient:
+    """
+    Reusable Triton Inference Server client.
+
+    Holds one keep-alive HTTP connection pool (requests.Session) and one gRPC
+    client/channel for its lifetime, and sends tensors with Triton's binary
+    data extension so payloads are raw bytes instead of base64 inside JSON.
+
+    Two request shapes are supported:
+      - infer_clip(): raw clip bytes as a BYTES "VIDEO" input -> LABEL/CONFIDENCE
+        (server-side decoding ensemble)
+      - infer_tensor(): preprocessed float32 (B, T, 3, H, W) tensor -> logits
+
+    "details" in each result is Triton's response header: model_name,
+    model_version and the outputs' names, datatypes and shapes.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        model_name: str = "videoswin",
+        protocol: str = "http",
+        timeout: float = 30,
+        pool_size: int = 8,
+        class_names: Optional[List[str]] = None
+    ):
+        self.url = url.rstrip('/')
+        self.model_name = model_name
+        self.protocol = protocol
+        self.timeout = timeout
+        self.class_names = class_names
+        self._grpc_client = None
+
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @property
+    def grpc_client(self):
+        """gRPC client created on first use and reused for every request"""
+        if self._grpc_client is None:
+            if not GRPC_AVAILABLE:
+                raise RuntimeError("gRPC client not available. Install tritonclient[grpc]")
+            self._grpc_client = grpcclient.InferenceServerClient(url=self.url)
+        return self._grpc_client
+
+    def _post_binary(self, inputs, output_names) -> tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        body, header_length = encode_binary_request(inputs, output_names)
+        response = self.session.post(
+            f"{self.url}/v2/models/{self.model_name}/infer",
+            data=body,
+            headers={
+                "Content-Type": "application/octet-stream",
+                "Inference-Header-Content-Length": str(header_length)
+            },
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        response_header = response.headers.get("Inference-Header-Content-Length")
+        return parse_binary_response(
+            response.content,
+            int(response_header) if response_header is not None else None
+        )
+
+    def infer_clip(self, clip_path: str) -> Dict[str, Any]:
+        """Send the encoded clip file; the server decodes and returns LABEL/CONFIDENCE"""
+        with open(clip_path, 'rb') as f:
+            clip_data = f.read()
+
+        if self.protocol == "grpc":
+            inputs = [grpcclient.InferInput("VIDEO", [1], "BYTES")]
+            inputs[0].set_data_from_numpy(np.array([clip_data], dtype=object))
+            outputs = [grpcclient.InferRequestedOutput("LABEL"), grpcclient.InferRequestedOutput("CONFIDENCE")]
+            result = self.grpc_client.infer(self.model_name, inputs, outputs=outputs)
+            label = result.as_numpy("LABEL").reshape(-1)[0]
+            confidence = result.as_numpy("CONFIDENCE").reshape(-1)[0]
+            details = _grpc_response_header(result)
+            model = "videoswin-triton-grpc"
+        else:
+            details, outputs = self._post_binary([("VIDEO", "BYTES", [1], [clip_data])], ["LABEL", "CONFIDENCE"])
+            if "LABEL" not in outputs or "CONFIDENCE" not in outputs:
+                raise ValueError("Missing outputs from Triton")
+            label = outputs["LABEL"].reshape(-1)[0]
+            confidence = outputs["CONFIDENCE"].reshape(-1)[0]
+            model = "videoswin-triton"
+
+        if isinstance(label, bytes):
+            label = label.decode('utf-8')
+        return {
+            "label": label,
+            "confidence": float(confidence),
+            "model": model,
+            "details": details
+        }
+
+    def infer_tensor(
+        self,
+        clip_tensor: np.ndarray,
+        input_name: str = "input",
+        output_name: str = "output"
+    ) -> Dict[str, Any]:
+        """Send a preprocessed float32 clip tensor and decode the returned logits"""
+        clip_tensor = np.ascontiguousarray(clip_tensor, dtype=np.float32)
+
+        if self.protocol == "grpc":
+            infer_input = grpcclient.InferInput(input_name, list(clip_tensor.shape), "FP32")
+            infer_input.set_data_from_numpy(clip_tensor)
+            result = self.grpc_client.infer(
+                self.model_name, [infer_input], outputs=[grpcclient.InferRequestedOutput(output_name)]
+            )
+            logits = result.as_numpy(output_name)
+            details = _grpc_response_header(result)
+            model = "videoswin-triton-grpc"
+        else:
+            details, outputs = self._post_binary([(input_name, "FP32", clip_tensor.shape, clip_tensor)], [output_name])
+            if output_name not in outputs:
+                raise ValueError(f"Missing output '{output_name}' from Triton")
+            logits = outputs[output_name]
+            model = "videoswin-triton"
+
+        label, confidence = _logits_to_prediction(logits[0] if logits.ndim > 1 else logits, self.class_names)
+        return {
+            "label": label,
+            "confidence": confidence,
+            "model": model,
+            "details": dict(details, logits_shape=list(logits.shape))
+        }
+
+    def close(self):
+        self.session.close()
+        if self._grpc_client is not None:
+            self._grpc_client.close()
+            self._grpc_client = None
+
+
+class TorchServeClient:
+    """TorchServe client reusing one keep-alive HTTP connection pool"""
+
+    def __init__(self, url: str, model_name: str = "videoswin", timeout: float = 30, pool_size: int = 8):
+        self.url = url.rstrip('/')
+        self.model_name = model_name
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def infer_clip(self, clip_path: str) -> Dict[str, Any]:
+        # The videoswin handler expects {"clip": <base64>}; only the connection is reused here
+        with open(clip_path, 'rb') as f:
+            clip_data = base64.b64encode(f.read()).decode('utf-8')
+
+        response = self.session.post(
+            f"{self.url}/predictions/{self.model_name}",
+            json={"clip": clip_data},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        result = response.json()
+
+        return {
+            "label": result.get("label", "unknown"),
+            "confidence": float(result.get("confidence", 0.0)),
+            "model": "videoswin-torchserve",
+            "details": result
+        }
+
+    def close(self):
+        self.session.close()
+
+
+# One client per (kind, url, model), shared by the call_* helpers below
+_CLIENTS: Dict[tuple, Any] = {}
+
+
+def get_triton_client(url: str, model_name: str = "videoswin", protocol: str = "http") -> TritonClient:
+    key = ("triton", protocol, url, model_name)
+    if key not in _CLIENTS:
+        _CLIENTS[key] = TritonClient(url, model_name, protocol=protocol)
+    return _CLIENTS[key]
+
+
+def get_torchserve_client(url: str, model_name: str = "videoswin") -> TorchServeClient:
+    key = ("torchserve", url, model_name)
+    if key not in _CLIENTS:
+        _CLIENTS[key] = TorchServeClient(url, model_name)
+    return _CLIENTS[key]
+
+
 def call_triton_rest(
     url: str,
     clip_path: str,
@@ -40,52 +348,7 @@ def call_triton_rest(
         Inference result with label and confidence
     """
     try:
-        with open(clip_path, 'rb') as f:
-            clip_data = base64.b64encode(f.read()).decode('utf-8')
-        
-        payload = {
-            "inputs": [
-                {
-                    "name": "VIDEO",
-                    "shape": [1],
-                    "datatype": "BYTES",
-                    "data": [clip_data]
-                }
-            ],
-            "outputs": [
-                {"name": "LABEL"},
-                {"name": "CONFIDENCE"}
-            ]
-        }
-        
-        response = requests.post(
-            f"{url}/v2/models/{model_name}/infer",
-            json=payload,
-            headers={"Content-Type": "application/json"},
-            timeout=30
-        )
-        
-        response.raise_for_status()
-        result = response.json()
-        
-        # Extract outputs
-        outputs = result.get("outputs", [])
-        label_data = next((o for o in outputs if o["name"] == "LABEL"), None)
-        conf_data = next((o for o in outputs if o["name"] == "CONFIDENCE"), None)
-        
-        if not label_data or not conf_data:
-            raise ValueError("Missing outputs from Triton")
-        
-        label = label_data["data"][0]
-        confidence = float(conf_data["data"][0])
-        
-        return {
-            "label": label,
-            "confidence": confidence,
-            "model": "videoswin-triton",
-            "details": result
-        }
-    
+        return get_triton_client(url, model_name).infer_clip(clip_path)
     except Exception as e:
         raise RuntimeError(f"Triton REST inference failed: {e}")
 
@@ -110,37 +373,13 @@ def call_triton_grpc(
         raise RuntimeError("gRPC client not available. Install tritonclient[grpc]")
     
     try:
-        triton_client = grpcclient.InferenceServerClient(url=url)
-        
-        with open(clip_path, 'rb') as f:
-            clip_data = f.read()
-        
-        inputs = []
-        inputs.append(grpcclient.InferInput("VIDEO", [1], "BYTES"))
-        inputs[0].set_data_from_numpy(np.array([clip_data], dtype=object))
-        
-        outputs = []
-        outputs.append(grpcclient.InferRequestedOutput("LABEL"))
-        outputs.append(grpcclient.InferRequestedOutput("CONFIDENCE"))
-        
-        result = triton_client.infer(model_name, inputs, outputs=outputs)
-        
-        label = result.as_numpy("LABEL")[0].decode('utf-8')
-        confidence = float(result.as_numpy("CONFIDENCE")[0])
-        
-        return {
-            "label": label,
-            "confidence": confidence,
-            "model": "videoswin-triton-grpc",
-            "details": {}
-        }
-    
+        return get_triton_client(url, model_name, protocol="grpc").infer_clip(clip_path)
     except Exception as e:
         raise RuntimeError(f"Triton gRPC inference failed: {e}")
 
 
 def call_torchserve(
-        url: str,
+    url: str,
     clip_path: str,
     model_name: str = "videoswin"
 ) -> Dict[str, Any]:
@@ -156,26 +395,7 @@ def call_torchserve(
         Inference result
     """
     try:
-        with open(clip_path, 'rb') as f:
-            clip_data = base64.b64encode(f.read()).decode('utf-8')
-        
-        response = requests.post(
-            f"{url}/predictions/{model_name}",
-            json={"clip": clip_data},
-            headers={"Content-Type": "application/json"},
-            timeout=30
-        )
-        
-        response.raise_for_status()
-        result = response.json()
-        
-        return {
-            "label": result.get("label", "unknown"),
-            "confidence": float(result.get("confidence", 0.0)),
-            "model": "videoswin-torchserve",
-            "details": result
-        }
-    
+        return get_torchserve_client(url, model_name).infer_clip(clip_path)
     except Exception as e:
         raise RuntimeError(f"TorchServe inference failed: {e}")
 
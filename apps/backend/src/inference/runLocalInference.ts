@@ -2,12 +2,19 @@ import { spawn } from 'child_process'
 import path from 'path'
 import fs from 'fs/promises'
 import { InferenceResult } from '../types/inference'
+import { PythonJsonWorker } from '../services/pythonWorker'
 
 const PYTHON_SCRIPT_PATH = path.join(__dirname, '../../scripts/run_pytorch_infer.py')
 const TRITON_URL = process.env.TRITON_URL
 const TORCHSERVE_URL = process.env.TORCHSERVE_URL
 const MODELS_DIR = path.join(__dirname, '../../../models')
 const AVAILABLE_MODEL_FILE = path.join(MODELS_DIR, 'AVAILABLE_VIDEO_MODEL.txt')
+// Set LOCAL_INFERENCE_WORKER=false to fall back to one Python process per clip
+const USE_PERSISTENT_WORKER = process.env.LOCAL_INFERENCE_WORKER !== 'false'
+const WORKER_REQUEST_TIMEOUT_MS = 30000
+// Micro-batching knobs forwarded to the worker (clips per forward pass, max wait in µs)
+const WORKER_MAX_BATCH_SIZE = process.env.LOCAL_INFERENCE_MAX_BATCH_SIZE || '8'
+const WORKER_MAX_WAIT_US = process.env.LOCAL_INFERENCE_MAX_WAIT_US || '2000'
 
 /**
  * Check if a server video model is available
@@ -182,12 +189,42 @@ async function runTorchServeInference(
   }
 }
 
+/**
+ * Long-lived `run_pytorch_infer.py --serve` process.
+ * Loads the model once and answers JSON-lines requests, so each clip only
+ * pays for preprocessing + forward pass instead of Python/torch start-up.
+ */
+const localWorker = new PythonJsonWorker('Inference worker', [
+  PYTHON_SCRIPT_PATH, '--serve',
+  '--max-batch-size', WORKER_MAX_BATCH_SIZE,
+  '--max-wait-us', WORKER_MAX_WAIT_US
+], { timeoutMs: WORKER_REQUEST_TIMEOUT_MS })
+
 /**
  * Run inference using local PyTorch script
  */
 async function runLocalPyTorchInference(
   clipPath: string,
   landmarks?: number[][]
+): Promise<InferenceResult> {
+  if (USE_PERSISTENT_WORKER) {
+    const result = await localWorker.request({ clip: clipPath })
+    return {
+      label: result.label,
+      confidence: result.confidence,
+      model: 'videoswin-local',
+      details: result
+    }
+  }
+  return runLocalPyTorchInferenceOnce(clipPath, landmarks)
+}
+
+/**
+ * Run inference by spawning a fresh Python process for a single clip
+ */
+async function runLocalPyTorchInferenceOnce(
+  clipPath: string,
+  landmarks?: number[][]
 ): Promise<InferenceResult> {
   return new Promise((resolve, reject) => {
     const pythonProcess = spawn('python', [
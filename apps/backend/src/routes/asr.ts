@@ -1,16 +1,41 @@
 import { Router } from 'express'
+import path from 'path'
 import { authMiddleware } from '../middleware/auth'
+import { PythonJsonWorker } from '../services/pythonWorker'
 
 // ASR route: accepts audio chunk (base64 PCM/WAV or webm) and returns { text, lang, confidence }
 // Backends: 'whisper' (local runner), 'vosk' (placeholder), 'openai' (cloud API)
 
 const router = Router()
 
+// Resident `run_asr_infer.py --serve` process: Whisper models stay loaded across chunks.
+// Set ASR_WORKER=false to fall back to one Python process per chunk.
+const USE_ASR_WORKER = process.env.ASR_WORKER !== 'false'
+const asrWorker = new PythonJsonWorker('ASR worker', [
+  path.join(__dirname, '../../scripts/run_asr_infer.py'),
+  '--serve',
+  '--model', process.env.WHISPER_MODEL || 'base'
+], { cwd: path.join(__dirname, '../..'), timeoutMs: 60000 })
+
 type AsrRequestBody = {
   audioBase64?: string
   audioMimeType?: string
   lang?: 'en' | 'ta' | 'ml' | 'te'
   meta?: Record<string, unknown>
+  // Streaming captions: chunks sharing a sessionId are stitched incrementally by the worker.
+  // Consecutive MediaRecorder timeslices are fine: the worker keeps the first webm chunk's
+  // header and prepends it to the later ones, so that first chunk must be sent to the session
+  sessionId?: string
+  final?: boolean
+}
+
+function sessionKey(body: AsrRequestBody): string | undefined {
+  if (body.sessionId) {
+    return body.sessionId
+  }
+  const meetingId = body.meta?.meetingId
+  const participantId = body.meta?.participantId
+  return meetingId && participantId ? `${meetingId}:${participantId}` : undefined
 }
 
 router.post('/asr', authMiddleware, async (req, res) => {
@@ -60,9 +85,42 @@ router.post('/asr', authMiddleware, async (req, res) => {
       const useLocal = process.env.WHISPER_LOCAL === 'true' || process.env.WHISPER_LOCAL
       const whisperModel = process.env.WHISPER_MODEL || 'base'
       
+      if (USE_ASR_WORKER) {
+        try {
+          const session = sessionKey(body)
+          const obj = await asrWorker.request({
+            audioBase64: body.audioBase64,
+            audioMimeType: body.audioMimeType || 'audio/webm',
+            lang,
+            model: whisperModel,
+            ...(session ? { session, final: body.final === true } : {})
+          })
+          if (session) {
+            // Only newly committed words are in `text`; `partial` may still change
+            return res.json({
+              text: obj.final_text,
+              partial: obj.partial_text,
+              isFinal: obj.is_final,
+              lang,
+              confidence: obj.confidence ?? null,
+              source: 'whisper-local',
+              timings: obj.timings
+            })
+          }
+          return res.json({
+            text: obj.text,
+            lang,
+            confidence: obj.confidence ?? null,
+            source: 'whisper-local',
+            timings: obj.timings
+          })
+        } catch (e: any) {
+          return res.status(502).json({ error: 'local whisper failed', details: e?.message || String(e) })
+        }
+      }
+
       // Spawn a python subprocess that reads base64 from stdin and prints JSON { text, confidence }
       const { spawn } = await import('child_process')
-      const path = await import('path')
       const scriptPath = path.join(__dirname, '../../scripts/run_asr_infer.py')
       
       const py = spawn('python', ['-u', scriptPath, '--lang', lang, '--model', whisperModel], {
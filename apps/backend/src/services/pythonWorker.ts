@@ -0,0 +1,148 @@
+import { spawn, ChildProcessWithoutNullStreams } from 'child_process'
+import readline from 'readline'
+
+type WorkerMessage = Record<string, any>
+
+type PendingRequest = {
+  resolve: (message: WorkerMessage) => void
+  reject: (error: Error) => void
+  onPartial?: (message: WorkerMessage) => void
+  timer: NodeJS.Timeout
+}
+
+type PythonWorkerOptions = {
+  cwd?: string
+  timeoutMs?: number
+}
+
+/**
+ * Long-lived Python process speaking JSON-lines over stdin/stdout.
+ *
+ * Protocol (shared by the `--serve` modes of the backend scripts):
+ * - the worker's first line is `{ "ready": true, ... }` (or `{ "ready": false, "error" }`)
+ * - each request is one line carrying an `id`; replies echo that `id`
+ *   and may arrive out of order
+ * - replies with `partial: true` are streamed to `onPartial`; the next
+ *   reply without it settles the request
+ *
+ * The process is spawned lazily on the first request and respawned on the
+ * next request after it exits.
+ */
+export class PythonJsonWorker {
+  private process: ChildProcessWithoutNullStreams | null = null
+  private ready: Promise<WorkerMessage> | null = null
+  private pending = new Map<number, PendingRequest>()
+  private nextId = 1
+  private stderr = ''
+
+  constructor(
+    private readonly name: string,
+    private readonly args: string[],
+    private readonly options: PythonWorkerOptions = {}
+  ) {}
+
+  private start(): Promise<WorkerMessage> {
+    if (this.ready) {
+      return this.ready
+    }
+
+    this.ready = new Promise((resolve, reject) => {
+      const pythonProcess = spawn('python', ['-u', ...this.args], { cwd: this.options.cwd })
+      this.process = pythonProcess
+      this.stderr = ''
+      let isReady = false
+
+      const lines = readline.createInterface({ input: pythonProcess.stdout })
+      lines.on('line', (line) => {
+        let message: WorkerMessage
+        try {
+          message = JSON.parse(line)
+        } catch {
+          console.warn(`${this.name} emitted non-JSON output:`, line)
+          return
+        }
+
+        if (!isReady) {
+          if (message.ready) {
+            isReady = true
+            console.log(`${this.name} ready:`, JSON.stringify(message))
+            resolve(message)
+          } else {
+            reject(new Error(message.error || `${this.name} failed to start`))
+          }
+          return
+        }
+
+        this.dispatch(message)
+      })
+
+      pythonProcess.stderr.on('data', (data) => {
+        // Keep only the tail so a chatty worker cannot grow memory unbounded
+        this.stderr = (this.stderr + data.toString()).slice(-4096)
+      })
+
+      pythonProcess.on('error', (error) => {
+        this.reset(new Error(`Failed to spawn Python process: ${error.message}`))
+        reject(error)
+      })
+
+      pythonProcess.on('close', (code) => {
+        const error = new Error(`${this.name} exited with code ${code}: ${this.stderr}`)
+        this.reset(error)
+        reject(error)
+      })
+    })
+
+    return this.ready
+  }
+
+  private dispatch(message: WorkerMessage) {
+    const request = this.pending.get(message.id)
+    if (!request) {
+      return
+    }
+
+    if (message.partial) {
+      request.onPartial?.(message)
+      return
+    }
+
+    this.pending.delete(message.id)
+    clearTimeout(request.timer)
+
+    if (message.error) {
+      request.reject(new Error(`${this.name} failed: ${message.error}`))
+      return
+    }
+    request.resolve(message)
+  }
+
+  private reset(error: Error) {
+    for (const request of this.pending.values()) {
+      clearTimeout(request.timer)
+      request.reject(error)
+    }
+    this.pending.clear()
+    this.process = null
+    this.ready = null
+  }
+
+  async request(
+    payload: Record<string, any>,
+    onPartial?: (message: WorkerMessage) => void
+  ): Promise<WorkerMessage> {
+    await this.start()
+    const timeoutMs = this.options.timeoutMs ?? 30000
+
+    return new Promise((resolve, reject) => {
+      const id = this.nextId++
+      const timer = setTimeout(() => {
+        this.pending.delete(id)
+        reject(new Error(`${this.name} timed out after ${timeoutMs}ms`))
+      }, timeoutMs)
+
+      this.pending.set(id, { resolve, reject, onPartial, timer })
+      this.process!.stdin.write(JSON.stringify({ ...payload, id }) + '\n')
+    })
+  }
+}
@@ -6,17 +6,22 @@ from .wlasl import WLASLDataset
 from .phoenix import PhoenixDataset
 from .asllvd import ASLLVDDataset
 from .isl_kaggle import ISLKaggleDataset
+from .landmarks import LandmarkDataset
 from .transforms import VideoTransform, PoseTransform
 from .collate import collate_video, collate_poses
+from .sampler import BucketBatchSampler, dataset_lengths
 
 __all__ = [
     'WLASLDataset',
     'PhoenixDataset',
     'ASLLVDDataset',
     'ISLKaggleDataset',
+    'LandmarkDataset',
     'VideoTransform',
     'PoseTransform',
     'collate_video',
-    'collate_poses'
+    'collate_poses',
+    'BucketBatchSampler',
+    'dataset_lengths'
 ]
 
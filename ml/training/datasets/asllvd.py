@@ -5,14 +5,17 @@ ASLLVD (American Sign Language Lexicon Video Dataset) Loader
 import json
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-import cv2
+from typing import Dict, List, Optional, Sequence, Tuple
 import numpy as np
 from PIL import Image
 import torch
 from torch.utils.data import Dataset
 import logging
 
+from .frame_cache import FrameCache
+from .video_io import Sampler, load_clip_frames
+from .index_cache import cached_index, scan_class_directories
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,7 +35,10 @@ class ASLLVDDataset(Dataset):
         center_crop: bool = True,
         normalize: Optional[List[Tuple[float, float]]] = None,
         transform=None,
-        primary_view: str = 'front'  # 'front', 'side', 'top'
+        primary_view: str = 'front',  # 'front', 'side', 'top'
+        frame_cache_dir: Optional[str] = None,
+        frame_cache_max_gb: float = 50.0,
+        index_cache_dir: Optional[str] = None
     ):
         self.root = Path(root)
         self.split = split
@@ -41,6 +47,10 @@ class ASLLVDDataset(Dataset):
         self.resize = resize
         self.center_crop = center_crop
         self.transform = transform
+        # Opt-in: decode each video once, later epochs read resized frames from disk
+        self.frame_cache = FrameCache(frame_cache_dir, int(frame_cache_max_gb * (1 << 30)), resize) if frame_cache_dir else None
+        # Filesystem scans are cached here (default: <root>/.index_cache) and reused while their inputs are unchanged
+        self.index_cache_dir = index_cache_dir
         self.primary_view = primary_view
         
         # Check if dataset exists
@@ -74,35 +84,27 @@ class ASLLVDDataset(Dataset):
         
         if annotation_file:
             # Load from JSON
-            with open(annotation_file, 'r') as f:
-                data = json.load(f)
+            index = cached_index(
+                'asllvd',
+                {'root': str(self.root.resolve()), 'annotation_file': str(annotation_file.resolve())},
+                lambda: self._index_json(annotation_file),
+                self.index_cache_dir,
+                dataset_root=self.root
+            )
             
             # Build label mapping
-            all_labels = sorted(set(item.get('label', item.get('sign', '')) for item in data))
-            self.label_to_idx = {label: idx for idx, label in enumerate(all_labels)}
+            self.label_to_idx = {label: idx for idx, label in enumerate(index['labels'])}
             self.idx_to_label = {idx: label for label, idx in self.label_to_idx.items()}
             
             # Filter by split (signer-based or random)
             samples = []
-            for item in data:
-                label = item.get('label', item.get('sign', ''))
-                signer = item.get('signer', 'unknown')
-                video_path = self.root / item.get('video', item.get('path', ''))
-                
-                if not video_path.exists():
-                    continue
-                
+            for entry in index['samples']:
                 # Simple split based on signer hash
-                signer_hash = hash(signer) % 10
+                signer_hash = hash(entry['signer']) % 10
                 item_split = 'train' if signer_hash < 8 else ('val' if signer_hash < 9 else 'test')
                 
                 if item_split == self.split:
-                    samples.append({
-                        'video': str(video_path),
-                        'label': self.label_to_idx[label],
-                        'gloss': label,
-                        'signer': signer
-                    })
+                    samples.append(dict(entry, label=self.label_to_idx[entry['gloss']]))
             
             self.samples = samples
         else:
@@ -111,42 +113,52 @@ class ASLLVDDataset(Dataset):
         
         logger.info(f"Loaded {len(self.samples)} ASLLVD samples for split '{self.split}'")
     
+    def _index_json(self, annotation_file: Path):
+        """Index of annotated videos that exist on disk (the cached part of _load_annotations)"""
+        with open(annotation_file, 'r') as f:
+            data = json.load(f)
+        
+        entries = []
+        video_dirs = set()
+        for item in data:
+            label = item.get('label', item.get('sign', ''))
+            video_path = self.root / item.get('video', item.get('path', ''))
+            video_dirs.add(video_path.parent)
+            
+            if not video_path.exists():
+                continue
+            
+            entries.append(dict(video=str(video_path), gloss=label, signer=item.get('signer', 'unknown')))
+        
+        index = {'labels': sorted(set(item.get('label', item.get('sign', '')) for item in data)), 'samples': entries}
+        return index, [annotation_file] + sorted(video_dirs)
+    
     def _load_from_directory(self):
         """Load from directory structure"""
-        samples = []
-        class_dirs = [d for d in self.root.iterdir() if d.is_dir()]
-        
-        if len(class_dirs) == 0:
+        index = cached_index(
+            'asllvd',
+            {'root': str(self.root.resolve()), 'layout': 'directory'},
+            lambda: scan_class_directories(self.root, ('*.mp4', '*.avi')),
+            self.index_cache_dir,
+            dataset_root=self.root
+        )
+        
+        if len(index['labels']) == 0:
             self.samples = []
             self.label_to_idx = {}
             self.idx_to_label = {}
             return
         
-        all_labels = sorted([d.name for d in class_dirs])
-        self.label_to_idx = {label: idx for idx, label in enumerate(all_labels)}
+        self.label_to_idx = {label: idx for idx, label in enumerate(index['labels'])}
         self.idx_to_label = {idx: label for label, idx in self.label_to_idx.items()}
         
-        for label_idx, label in enumerate(all_labels):
-            class_dir = self.root / label
-            videos = list(class_dir.glob('*.mp4')) + list(class_dir.glob('*.avi'))
-            
-            # Simple split
-            split_videos = {'train': [], 'val': [], 'test': []}
-            for video in videos:
-                hash_val = hash(video.name) % 10
-                if hash_val < 8:
-                    split_videos['train'].append(video)
-                elif hash_val < 9:
-                    split_videos['val'].append(video)
-                else:
-                    split_videos['test'].append(video)
-            
-            for video in split_videos.get(self.split, []):
-                samples.append({
-                    'video': str(video),
-                    'label': label_idx,
-                    'gloss': label
-                })
+        # Simple split
+        samples = []
+        for entry in index['samples']:
+            hash_val = hash(Path(entry['video']).name) % 10
+            video_split = 'train' if hash_val < 8 else ('val' if hash_val < 9 else 'test')
+            if video_split == self.split:
+                samples.append(dict(entry, label=self.label_to_idx[entry['gloss']]))
         
         self.samples = samples
     
@@ -157,14 +169,10 @@ class ASLLVDDataset(Dataset):
         sample = self.samples[idx]
         video_path = sample['video']
         
-        frames = self._load_video(video_path)
-        
-        if len(frames) == 0:
-            frames = [np.zeros((self.resize, self.resize, 3), dtype=np.uint8)] * self.clip_len
-        
         if self.transform:
-            frames = self.transform(frames)
+            transform = self.transform
         else:
+            # Default transform
             from .transforms import VideoTransform
             transform = VideoTransform(
                 resize=self.resize,
@@ -172,7 +180,15 @@ class ASLLVDDataset(Dataset):
                 clip_len=self.clip_len,
                 frame_stride=self.frame_stride
             )
-            frames = transform(frames)
+        
+        # Load only the frames the transform will keep
+        frames = self._load_video(video_path, getattr(transform, 'sample_indices', None))
+        
+        if len(frames) == 0:
+            frames = [np.zeros((self.resize, self.resize, 3), dtype=np.uint8)] * self.clip_len
+        
+        # Apply transforms
+        frames = transform(frames)
         
         return {
             'video': frames,
@@ -181,21 +197,7 @@ class ASLLVDDataset(Dataset):
             'video_path': video_path
         }
     
-    def _load_video(self, video_path: str) -> List[np.ndarray]:
-        """Load video frames"""
-        cap = cv2.VideoCapture(video_path)
-        frames = []
-        
-        if not cap.isOpened():
-            return frames
-        
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frames.append(frame)
-        
-        cap.release()
-        return frames
+    def _load_video(self, video_path: str, sampler: Optional[Sampler] = None) -> Sequence[np.ndarray]:
+        """Load video frames (only the sampled ones when a sampler is given)"""
+        return load_clip_frames(video_path, sampler, self.frame_cache)
 
@@ -0,0 +1,116 @@
+"""
+Decoded-frame cache for video datasets
+Stores each clip's resized uint8 frames once on local disk so later epochs skip video decode
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Callable, List, Optional, Union
+import cv2
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached frame layout or resize rule changes so old entries are missed
+CACHE_VERSION = 2
+
+
+def resize_short_side(frame: np.ndarray, size: int) -> np.ndarray:
+    """Resize so the shorter side equals `size`, with transforms.Resize(size)'s output size (long side truncated)"""
+    h, w = frame.shape[:2]
+    if min(h, w) == size:
+        return frame
+    if h <= w:
+        new_h, new_w = size, int(size * w / h)
+    else:
+        new_h, new_w = int(size * h / w), size
+    return cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_AREA)
+
+
+class FrameCache:
+    """
+    On-disk cache of decoded clips: one (T, H, W, 3) uint8 .npy per video, with the
+    shorter side resized to `resize`, read back with np.load(mmap_mode='r').
+
+    Entries are keyed by video path, size, mtime and resize, so a re-encoded video
+    is decoded again. When the cache grows past `max_bytes`, the least recently used
+    entries are evicted; file mtimes serve as the LRU clock, so the cache can be
+    shared by every DataLoader worker and across runs.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], max_bytes: int = 50 << 30, resize: int = 224):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.resize = resize
+        # Bytes written by this process since the directory was last scanned
+        self._written = None
+
+    def _entry_path(self, video_path: str) -> Path:
+        stat = os.stat(video_path)
+        key = f"{os.path.abspath(video_path)}|{stat.st_size}|{stat.st_mtime_ns}|{self.resize}|v{CACHE_VERSION}"
+        return self.cache_dir / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.npy"
+
+    def get(self, video_path: str) -> Optional[np.ndarray]:
+        try:
+            path = self._entry_path(video_path)
+            frames = np.load(path, mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+        # Touch for LRU ordering; an entry evicted by another worker since the load is a miss
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return frames
+
+    def put(self, video_path: str, frames: np.ndarray):
+        path = self._entry_path(video_path)
+        # Write-then-rename: concurrent workers never see a partial entry
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.save(f, frames)
+        os.replace(tmp_path, path)
+
+        if self._written is None or self._written + frames.nbytes > self.max_bytes // 20:
+            self._evict()
+            self._written = 0
+        else:
+            self._written += frames.nbytes
+
+    def _evict(self):
+        entries = []
+        for path in self.cache_dir.glob('*.npy'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # evicted by another worker
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+
+    def load(self, video_path: str, decode: Callable[[str], List[np.ndarray]]) -> Union[np.ndarray, List[np.ndarray]]:
+        """Cached frames for `video_path`, decoding with `decode` (RGB frames) and caching on a miss"""
+        frames = self.get(video_path)
+        if frames is not None:
+            return frames
+
+        decoded = decode(video_path)
+        if len(decoded) == 0:
+            return decoded
+        frames = np.stack([resize_short_side(frame, self.resize) for frame in decoded])
+        try:
+            self.put(video_path, frames)
+        except OSError as e:
+            logger.warning(f"Could not cache frames for {video_path}: {e}")
+        return frames
@@ -0,0 +1,97 @@
+"""
+Cached dataset indexes
+Dataset constructors scan the filesystem (exists() per annotation row, class-directory
+globs) once; later runs reuse the result while the inputs are unchanged. Videos are
+listed, never opened, while indexing
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 2
+# Default cache location, inside the dataset root (hidden, so class-directory scans skip it)
+INDEX_DIR_NAME = '.index_cache'
+
+# build() returns the index data and the files/directories it was derived from
+Builder = Callable[[], Tuple[Dict, Iterable[Union[str, Path]]]]
+
+
+def _mtimes(paths: Iterable[Union[str, Path]]) -> Dict[str, Optional[int]]:
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[str(path)] = os.stat(path).st_mtime_ns
+        except OSError:
+            mtimes[str(path)] = None
+    return mtimes
+
+
+def cached_index(
+    name: str,
+    key: Dict,
+    build: Builder,
+    cache_dir: Optional[Union[str, Path]] = None,
+    dataset_root: Optional[Union[str, Path]] = None
+) -> Dict:
+    """
+    Index data for `key`, rebuilt with `build` when missing or stale
+
+    The cache file records the mtime of every input build() reports. Directory
+    mtimes change when entries are added, removed or renamed, so listing the
+    directories that hold the videos is enough to catch new or deleted clips
+    without touching each file. The cache lives in `cache_dir`, or in
+    <dataset_root>/.index_cache; write failures (e.g. a read-only dataset)
+    only cost the next run a rebuild.
+    """
+    if cache_dir is None and dataset_root is None:
+        raise ValueError("cached_index needs a cache_dir or a dataset_root")
+    cache_dir = Path(cache_dir) if cache_dir else Path(dataset_root) / INDEX_DIR_NAME
+    key = dict(key, name=name, version=INDEX_VERSION)
+    digest = hashlib.sha1(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+    cache_path = cache_dir / f"{name}_{digest}.json"
+
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached['key'] == key and _mtimes(cached['inputs']) == cached['inputs']:
+            return cached['data']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    data, inputs = build()
+    try:
+        # Created before the input mtimes are taken: adding .index_cache changes the root's mtime
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename: concurrent runs never read a partial index
+        tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'inputs': _mtimes(inputs), 'data': data}, f)
+        os.replace(tmp_path, cache_path)
+        logger.info(f"Wrote {name} index: {cache_path}")
+    except OSError as e:
+        logger.warning(f"Could not write {name} index to {cache_path}: {e}")
+    return data
+
+
+def scan_class_directories(root: Path, patterns: Sequence[str]) -> Tuple[Dict, List[Path]]:
+    """
+    Index of root/class_name/<video> layouts: class labels (sorted directory names)
+    and one entry per video, in glob order. Inputs are root and every class directory.
+    """
+    class_dirs = [d for d in root.iterdir() if d.is_dir() and not d.name.startswith('.')]
+    labels = sorted(d.name for d in class_dirs)
+
+    entries = []
+    for label in labels:
+        videos = []
+        for pattern in patterns:
+            videos.extend((root / label).glob(pattern))
+        for video in videos:
+            entries.append({'video': str(video), 'gloss': label})
+    return {'labels': labels, 'samples': entries}, [root] + class_dirs
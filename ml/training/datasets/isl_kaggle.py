@@ -6,14 +6,17 @@ Simple directory-based structure for Indian Sign Language
 import os
 import csv
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-import cv2
+from typing import Dict, List, Optional, Sequence, Tuple
 import numpy as np
 from PIL import Image
 import torch
 from torch.utils.data import Dataset
 import logging
 
+from .frame_cache import FrameCache
+from .video_io import Sampler, load_clip_frames
+from .index_cache import cached_index, scan_class_directories
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,7 +36,10 @@ class ISLKaggleDataset(Dataset):
         resize: int = 224,
         center_crop: bool = True,
         normalize: Optional[List[Tuple[float, float]]] = None,
-        transform=None
+        transform=None,
+        frame_cache_dir: Optional[str] = None,
+        frame_cache_max_gb: float = 50.0,
+        index_cache_dir: Optional[str] = None
     ):
         self.root = Path(root)
         self.split = split
@@ -42,6 +48,10 @@ class ISLKaggleDataset(Dataset):
         self.resize = resize
         self.center_crop = center_crop
         self.transform = transform
+        # Opt-in: decode each video once, later epochs read resized frames from disk
+        self.frame_cache = FrameCache(frame_cache_dir, int(frame_cache_max_gb * (1 << 30)), resize) if frame_cache_dir else None
+        # Filesystem scans are cached here (default: <root>/.index_cache) and reused while their inputs are unchanged
+        self.index_cache_dir = index_cache_dir
         
         # Check if dataset exists
         if not self.root.exists():
@@ -62,30 +72,20 @@ class ISLKaggleDataset(Dataset):
     
     def _load_from_csv(self, csv_file: str):
         """Load from CSV file"""
-        samples = []
-        label_set = set()
-        
-        with open(csv_file, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                label = row.get('label', row.get('class', row.get('sign', '')))
-                video_path = self.root / row.get('video', row.get('path', ''))
-                
-                if video_path.exists():
-                    label_set.add(label)
-                    samples.append({
-                        'video': str(video_path),
-                        'label_str': label
-                    })
+        index = cached_index(
+            'isl_kaggle',
+            {'root': str(self.root.resolve()), 'csv_file': str(Path(csv_file).resolve())},
+            lambda: self._index_csv(csv_file),
+            self.index_cache_dir,
+            dataset_root=self.root
+        )
         
         # Build label mapping
-        all_labels = sorted(label_set)
-        self.label_to_idx = {label: idx for idx, label in enumerate(all_labels)}
+        self.label_to_idx = {label: idx for idx, label in enumerate(index['labels'])}
         self.idx_to_label = {idx: label for label, idx in self.label_to_idx.items()}
         
         # Add label indices
-        for sample in samples:
-            sample['label'] = self.label_to_idx[sample['label_str']]
+        samples = [dict(entry, label=self.label_to_idx[entry['label_str']]) for entry in index['samples']]
         
         # Split
         split_samples = {'train': [], 'val': [], 'test': []}
@@ -101,45 +101,50 @@ class ISLKaggleDataset(Dataset):
         self.samples = split_samples.get(self.split, [])
         logger.info(f"Loaded {len(self.samples)} ISL Kaggle samples for split '{self.split}' from CSV")
     
+    def _index_csv(self, csv_file: str):
+        """Index of CSV rows whose video exists (the cached part of _load_from_csv)"""
+        entries = []
+        video_dirs = set()
+        
+        with open(csv_file, 'r') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                label = row.get('label', row.get('class', row.get('sign', '')))
+                video_path = self.root / row.get('video', row.get('path', ''))
+                video_dirs.add(video_path.parent)
+                
+                if video_path.exists():
+                    entries.append(dict(video=str(video_path), label_str=label))
+        
+        index = {'labels': sorted(set(entry['label_str'] for entry in entries)), 'samples': entries}
+        return index, [csv_file] + sorted(video_dirs)
+    
     def _load_from_directory(self):
         """Load from directory structure: root/class_name/*.mp4"""
-        samples = []
-        class_dirs = [d for d in self.root.iterdir() if d.is_dir()]
-        
-        if len(class_dirs) == 0:
+        index = cached_index(
+            'isl_kaggle',
+            {'root': str(self.root.resolve()), 'layout': 'directory'},
+            lambda: scan_class_directories(self.root, ('*.mp4', '*.avi', '*.mov')),
+            self.index_cache_dir,
+            dataset_root=self.root
+        )
+        
+        if len(index['labels']) == 0:
             logger.warning(f"No class directories found in {self.root}")
             self.samples = []
             self.label_to_idx = {}
             self.idx_to_label = {}
             return
         
-        all_labels = sorted([d.name for d in class_dirs])
-        self.label_to_idx = {label: idx for idx, label in enumerate(all_labels)}
+        self.label_to_idx = {label: idx for idx, label in enumerate(index['labels'])}
         self.idx_to_label = {idx: label for label, idx in self.label_to_idx.items()}
         
-        for label_idx, label in enumerate(all_labels):
-            class_dir = self.root / label
-            videos = list(class_dir.glob('*.mp4')) + list(class_dir.glob('*.avi')) + list(class_dir.glob('*.mov'))
-            
-            if len(videos) == 0:
-                continue
-            
-            split_videos = {'train': [], 'val': [], 'test': []}
-            for video in videos:
-                hash_val = hash(video.name) % 10
-                if hash_val < 8:
-                    split_videos['train'].append(video)
-                elif hash_val < 9:
-                    split_videos['val'].append(video)
-                else:
-                    split_videos['test'].append(video)
-            
-            for video in split_videos.get(self.split, []):
-                samples.append({
-                    'video': str(video),
-                    'label': label_idx,
-                    'gloss': label
-                })
+        samples = []
+        for entry in index['samples']:
+            hash_val = hash(Path(entry['video']).name) % 10
+            video_split = 'train' if hash_val < 8 else ('val' if hash_val < 9 else 'test')
+            if video_split == self.split:
+                samples.append(dict(entry, label=self.label_to_idx[entry['gloss']]))
         
         self.samples = samples
         logger.info(f"Loaded {len(self.samples)} ISL Kaggle samples for split '{self.split}' from directory structure")
@@ -151,14 +156,10 @@ class ISLKaggleDataset(Dataset):
         sample = self.samples[idx]
         video_path = sample['video']
         
-        frames = self._load_video(video_path)
-        
-        if len(frames) == 0:
-            frames = [np.zeros((self.resize, self.resize, 3), dtype=np.uint8)] * self.clip_len
-        
         if self.transform:
-            frames = self.transform(frames)
+            transform = self.transform
         else:
+            # Default transform
             from .transforms import VideoTransform
             transform = VideoTransform(
                 resize=self.resize,
@@ -166,7 +167,15 @@ class ISLKaggleDataset(Dataset):
                 clip_len=self.clip_len,
                 frame_stride=self.frame_stride
             )
-            frames = transform(frames)
+        
+        # Load only the frames the transform will keep
+        frames = self._load_video(video_path, getattr(transform, 'sample_indices', None))
+        
+        if len(frames) == 0:
+            frames = [np.zeros((self.resize, self.resize, 3), dtype=np.uint8)] * self.clip_len
+        
+        # Apply transforms
+        frames = transform(frames)
         
         return {
             'video': frames,
@@ -175,21 +184,7 @@ class ISLKaggleDataset(Dataset):
             'video_path': video_path
         }
     
-    def _load_video(self, video_path: str) -> List[np.ndarray]:
-        """Load video frames"""
-        cap = cv2.VideoCapture(video_path)
-        frames = []
-        
-        if not cap.isOpened():
-            return frames
-        
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frames.append(frame)
-        
-        cap.release()
-        return frames
+    def _load_video(self, video_path: str, sampler: Optional[Sampler] = None) -> Sequence[np.ndarray]:
+        """Load video frames (only the sampled ones when a sampler is given)"""
+        return load_clip_frames(video_path, sampler, self.frame_cache)
 
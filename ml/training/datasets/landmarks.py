@@ -0,0 +1,223 @@
+"""
+Preprocessed landmark dataset (memory-mapped)
+Reads the outputs of scripts/preprocess_extract_frames_and_landmarks.py and scripts/preprocess_dataset_clips.py
+without loading them into RAM
+"""
+
+import csv
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+import torch
+from torch.utils.data import Dataset
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Landmark rows per feature group for each on-disk layout
+# holistic: (T, 543, 3) pose | left hand | right hand | face
+# hands_pose: (T, 42|75, 3) or flattened (T, 126|225) two hands | pose
+FEATURE_ROWS = {
+    'holistic': {
+        'pose': (0, 33),
+        'left_hand': (33, 54),
+        'right_hand': (54, 75),
+        'hands': (33, 75),
+        'face': (75, 543)
+    },
+    'hands_pose': {
+        'left_hand': (0, 21),
+        'right_hand': (21, 42),
+        'hands': (0, 42),
+        'pose': (42, 75)
+    }
+}
+
+
+def landmark_windows(landmarks: np.ndarray, window: int, stride: int) -> np.ndarray:
+    """
+    Sliding windows over a (T, ...) landmark array without copying it
+
+    Returns a strided view of shape (num_windows, window, ...) whose windows start
+    at range(0, T - window + 1, stride); a memmap stays a view of the file.
+    A clip shorter than `window` gives a single short window.
+    """
+    if len(landmarks) < window:
+        return landmarks[None]
+    windows = sliding_window_view(landmarks, window, axis=0)[::stride]  # (N, ..., window)
+    return np.moveaxis(windows, -1, 1)
+
+
+class LandmarkDataset(Dataset):
+    """
+    Landmark sequences for PoseFormerV2 and other pose models
+
+    Supported inputs under `root`:
+    - a sharded landmark store (index.csv + shard_*.npy, see scripts/landmark_store.py)
+    - {split}/labels.csv, or a labels.csv whose split column is filtered on
+      (clip_id,class_name,clip_path,split as written by preprocess_dataset_clips.py)
+    - per-clip directories {split}/{class}/{clip_id}/landmarks.npy
+
+    Files are opened with np.load(mmap_mode='r'), so only the frames and
+    landmark rows of the requested feature groups are read per sample.
+    With `window` set every clip is split into sliding windows of `window`
+    frames every `stride` frames (default: non-overlapping), one sample each,
+    taken as views over the memmap (see landmark_windows).
+    Returns {'pose': (T, F) float32, 'label', 'length'} like SyntheticPoseDataset.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        split: str = 'train',
+        features: Sequence[str] = ('hands', 'pose'),
+        clip_len: Optional[int] = None,
+        label_to_idx: Optional[Dict[str, int]] = None,
+        window: Optional[int] = None,
+        stride: Optional[int] = None
+    ):
+        self.root = Path(root)
+        self.split = split
+        self.features = list(features)
+        self.clip_len = clip_len
+        self.window = window
+        self.stride = stride or window
+        self.samples: List[Dict] = []
+        self._shards: Dict[int, np.ndarray] = {}
+
+        if not self.root.exists():
+            logger.warning(f"Landmark data not found at {self.root}. Skipping.")
+            self.label_to_idx = label_to_idx or {}
+            self.idx_to_label = {idx: label for label, idx in self.label_to_idx.items()}
+            return
+
+        if (self.root / 'index.csv').exists():
+            self._load_from_store()
+        elif (self.root / self.split / 'labels.csv').exists():
+            self._load_from_labels_csv(self.root / self.split / 'labels.csv', filter_split=False)
+        elif (self.root / 'labels.csv').exists():
+            self._load_from_labels_csv(self.root / 'labels.csv')
+        else:
+            self._load_from_directory()
+
+        # Pass the training set's mapping to val/test so label ids agree
+        all_labels = sorted(set(sample['gloss'] for sample in self.samples))
+        self.label_to_idx = label_to_idx or {label: idx for idx, label in enumerate(all_labels)}
+        self.idx_to_label = {idx: label for label, idx in self.label_to_idx.items()}
+        self.samples = [s for s in self.samples if s['gloss'] in self.label_to_idx]
+        if self.window:
+            self._split_windows()
+
+        if len(self.samples) == 0:
+            logger.warning(f"No landmark samples found for split '{split}'. Dataset may be empty.")
+        else:
+            logger.info(f"Loaded {len(self.samples)} landmark samples for split '{self.split}'")
+
+    def _load_from_store(self):
+        """Sharded store: one index row per clip"""
+        with open(self.root / 'index.csv', 'r', newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                if row['split'] != self.split:
+                    continue
+                self.samples.append({
+                    'shard': int(row['shard']),
+                    'start': int(row['start']),
+                    'length': int(row['length']),
+                    'gloss': row['class_name']
+                })
+
+    def _load_from_labels_csv(self, labels_csv: Path, filter_split: bool = True):
+        """
+        labels.csv written by the dataset-format preprocessor
+
+        A per-split labels.csv ({split}/labels.csv) is used whole; a shared one
+        must say which split each clip belongs to, otherwise train and val
+        would both load every clip.
+        """
+        with open(labels_csv, 'r', newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        if filter_split:
+            splits = set(row.get('split') or 'unknown' for row in rows)
+            if splits <= {'unknown'}:
+                raise ValueError(
+                    f"{labels_csv} has no split column (or only 'unknown' splits); rerun "
+                    f"scripts/preprocess_dataset_clips.py with --split or use {{split}}/labels.csv"
+                )
+            rows = [row for row in rows if row.get('split') == self.split]
+        for row in rows:
+            path = Path(row['clip_path']) / 'landmarks.npy'
+            self.samples.append({'path': str(path), 'gloss': row['class_name']})
+
+    def _load_from_directory(self):
+        """Per-clip directories: root/{split}/{class}/{clip_id}/landmarks.npy (or without the split level)"""
+        split_root = self.root / self.split if (self.root / self.split).exists() else self.root
+        for path in sorted(split_root.glob('*/*/landmarks.npy')):
+            self.samples.append({'path': str(path), 'gloss': path.parent.parent.name})
+
+    def _split_windows(self):
+        """One sample per sliding window; clip lengths come from the index or .npy headers"""
+        windowed = []
+        for sample in self.samples:
+            if 'length' not in sample:
+                sample['length'] = int(self._open(sample).shape[0])
+            num_windows = len(range(0, sample['length'] - self.window + 1, self.stride)) or 1
+            windowed.extend(dict(sample, window_idx=w) for w in range(num_windows))
+        self.samples = windowed
+
+    def _open(self, sample: Dict) -> np.ndarray:
+        """Memory-mapped (T, ...) array for one sample; nothing is read until it is indexed"""
+        if 'shard' in sample:
+            shard = self._shards.get(sample['shard'])
+            if shard is None:
+                shard_path = self.root / f"shard_{sample['shard']:05d}.npy"
+                shard = self._shards[sample['shard']] = np.load(shard_path, mmap_mode='r')
+            return shard[sample['start']:sample['start'] + sample['length']]
+        return np.load(sample['path'], mmap_mode='r')
+
+    def _feature_rows(self, rows: int) -> List[tuple]:
+        layout = 'holistic' if rows == 543 else 'hands_pose'
+        spans = []
+        for feature in self.features:
+            start, end = FEATURE_ROWS[layout].get(feature, (0, rows + 1))
+            if end > rows:
+                raise ValueError(f"Feature '{feature}' not present in landmarks with {rows} rows")
+            spans.append((start, end))
+        return spans
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def lengths(self) -> List[int]:
+        """Sequence length of every sample, from the index or .npy headers (for length bucketing)"""
+        if self.clip_len:
+            return [self.clip_len] * len(self.samples)
+        for sample in self.samples:
+            if 'length' not in sample:
+                sample['length'] = int(self._open(sample).shape[0])
+        if self.window:
+            return [min(sample['length'], self.window) for sample in self.samples]
+        return [sample['length'] for sample in self.samples]
+
+    def __getitem__(self, idx: int) -> Dict:
+        sample = self.samples[idx]
+        landmarks = self._open(sample)
+        if 'window_idx' in sample:
+            landmarks = landmark_windows(landmarks, self.window, self.stride)[sample['window_idx']]
+
+        # Temporal sampling on the memmap: only the selected frames are paged in
+        T = landmarks.shape[0]
+        if self.clip_len and T != self.clip_len:
+            landmarks = landmarks[np.linspace(0, T - 1, self.clip_len).astype(np.int64)]
+
+        if landmarks.ndim == 2:
+            landmarks = landmarks.reshape(landmarks.shape[0], -1, 3)
+        spans = self._feature_rows(landmarks.shape[1])
+        pose = np.concatenate([landmarks[:, start:end] for start, end in spans], axis=1)
+        pose = torch.from_numpy(np.ascontiguousarray(pose, dtype=np.float32).reshape(pose.shape[0], -1))
+
+        return {
+            'pose': pose,
+            'label': self.label_to_idx[sample['gloss']],
+            'length': pose.shape[0]
+        }
@@ -6,14 +6,17 @@ Continuous sign language recognition with gloss and text annotations
 import os
 import csv
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-import cv2
+from typing import Dict, List, Optional, Sequence, Tuple
 import numpy as np
 from PIL import Image
 import torch
 from torch.utils.data import Dataset
 import logging
 
+from .frame_cache import FrameCache
+from .video_io import Sampler, load_clip_frames
+from .index_cache import cached_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,7 +37,10 @@ class PhoenixDataset(Dataset):
         normalize: Optional[List[Tuple[float, float]]] = None,
         transform=None,
         vocab_gloss: Optional[Dict[str, int]] = None,
-        vocab_text: Optional[Dict[str, int]] = None
+        vocab_text: Optional[Dict[str, int]] = None,
+        frame_cache_dir: Optional[str] = None,
+        frame_cache_max_gb: float = 50.0,
+        index_cache_dir: Optional[str] = None
     ):
         self.root = Path(root)
         self.split = split
@@ -43,6 +49,10 @@ class PhoenixDataset(Dataset):
         self.resize = resize
         self.center_crop = center_crop
         self.transform = transform
+        # Opt-in: decode each video once, later epochs read resized frames from disk
+        self.frame_cache = FrameCache(frame_cache_dir, int(frame_cache_max_gb * (1 << 30)), resize) if frame_cache_dir else None
+        # Filesystem scans are cached here (default: <root>/.index_cache) and reused while their inputs are unchanged
+        self.index_cache_dir = index_cache_dir
         self.vocab_gloss = vocab_gloss or {}
         self.vocab_text = vocab_text or {}
         
@@ -76,7 +86,30 @@ class PhoenixDataset(Dataset):
             self.samples = []
             return
         
+        index = cached_index(
+            'phoenix',
+            {'annotation_file': str(annotation_file.resolve()), 'video_root': str(video_root.resolve())},
+            lambda: self._index_annotations(annotation_file, video_root),
+            self.index_cache_dir,
+            dataset_root=self.root
+        )
+        
         samples = []
+        for entry in index['samples']:
+            # Tokenize gloss sequence (after the cache, so vocab changes need no re-index)
+            gloss_tokens = self._tokenize_gloss(entry['gloss_str'])
+            text_tokens = self._tokenize_text(entry['text_str']) if entry['text_str'] else []
+            samples.append(dict(entry, gloss=gloss_tokens, text=text_tokens))
+        
+        self.samples = samples
+        logger.info(f"Loaded {len(self.samples)} PHOENIX samples for split '{self.split}'")
+    
+    def _index_annotations(self, annotation_file: Path, video_root: Path):
+        """Index of annotated sentences whose video exists (the cached part of _load_annotations)"""
+        # One listing of the video directory instead of probing .mp4 then .avi per row
+        available = {p.name for p in video_root.iterdir()} if video_root.is_dir() else set()
+        
+        entries = []
         with open(annotation_file, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f, delimiter='|')
             for row in reader:
@@ -85,28 +118,16 @@ class PhoenixDataset(Dataset):
                 text = row.get('translation', '').strip()
                 
                 # Find video file
-                video_path = video_root / f"{name}.mp4"
-                if not video_path.exists():
+                if f"{name}.mp4" in available:
+                    video_path = video_root / f"{name}.mp4"
+                elif f"{name}.avi" in available:
                     video_path = video_root / f"{name}.avi"
-                
-                if not video_path.exists():
+                else:
                     continue
                 
-                # Tokenize gloss sequence
-                gloss_tokens = self._tokenize_gloss(gloss)
-                text_tokens = self._tokenize_text(text) if text else []
-                
-                samples.append({
-                    'video': str(video_path),
-                    'gloss': gloss_tokens,
-                    'text': text_tokens,
-                    'gloss_str': gloss,
-                    'text_str': text,
-                    'name': name
-                })
+                entries.append(dict(video=str(video_path), gloss_str=gloss, text_str=text, name=name))
         
-        self.samples = samples
-        logger.info(f"Loaded {len(self.samples)} PHOENIX samples for split '{self.split}'")
+        return {'samples': entries}, [annotation_file, video_root]
     
     def _tokenize_gloss(self, gloss_str: str) -> List[int]:
         """Tokenize gloss sequence to vocabulary indices"""
@@ -143,17 +164,10 @@ class PhoenixDataset(Dataset):
         sample = self.samples[idx]
         video_path = sample['video']
         
-        # Load video frames
-        frames = self._load_video(video_path)
-        
-        if len(frames) == 0:
-            logger.warning(f"Could not load video: {video_path}")
-            frames = [np.zeros((self.resize, self.resize, 3), dtype=np.uint8)] * self.clip_len
-        
-        # Apply transforms
         if self.transform:
-            frames = self.transform(frames)
+            transform = self.transform
         else:
+            # Default transform
             from .transforms import VideoTransform
             transform = VideoTransform(
                 resize=self.resize,
@@ -161,7 +175,16 @@ class PhoenixDataset(Dataset):
                 clip_len=self.clip_len,
                 frame_stride=self.frame_stride
             )
-            frames = transform(frames)
+        
+        # Load only the frames the transform will keep
+        frames = self._load_video(video_path, getattr(transform, 'sample_indices', None))
+        
+        if len(frames) == 0:
+            logger.warning(f"Could not load video: {video_path}")
+            frames = [np.zeros((self.resize, self.resize, 3), dtype=np.uint8)] * self.clip_len
+        
+        # Apply transforms
+        frames = transform(frames)
         
         result = {
             'video': frames,
@@ -175,21 +198,7 @@ class PhoenixDataset(Dataset):
         
         return result
     
-    def _load_video(self, video_path: str) -> List[np.ndarray]:
-        """Load video frames using OpenCV"""
-        cap = cv2.VideoCapture(video_path)
-        frames = []
-        
-        if not cap.isOpened():
-            return frames
-        
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frames.append(frame)
-        
-        cap.release()
-        return frames
+    def _load_video(self, video_path: str, sampler: Optional[Sampler] = None) -> Sequence[np.ndarray]:
+        """Load video frames (only the sampled ones when a sampler is given)"""
+        return load_clip_frames(video_path, sampler, self.frame_cache)
 
@@ -0,0 +1,144 @@
+"""
+Length-bucketed batch sampling for variable-length landmark sequences
+Keeps short and long clips (e.g. 20- and 300-frame sentences) out of the same padded
+batch. Only datasets that return native-length sequences benefit: LandmarkDataset with
+clip_len=None. Video datasets resample every clip to a fixed clip_len, so they have no
+padding to save and provide no lengths()
+"""
+
+from typing import Dict, Iterator, List, Optional, Sequence
+import numpy as np
+from torch.utils.data import Sampler
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def dataset_lengths(dataset) -> List[int]:
+    """
+    Per-sample sequence lengths without decoding anything
+    Uses the dataset's lengths() method (ConcatDataset children are concatenated)
+    """
+    if hasattr(dataset, 'lengths'):
+        return list(dataset.lengths())
+    if hasattr(dataset, 'datasets'):
+        lengths = []
+        for child in dataset.datasets:
+            lengths.extend(dataset_lengths(child))
+        return lengths
+    raise ValueError(f"{dataset.__class__.__name__} does not provide lengths() for bucketing")
+
+
+class BucketBatchSampler(Sampler):
+    """
+    Batch sampler that groups samples of similar length
+
+    Samples are split into `num_buckets` length buckets (quantiles of `lengths`).
+    Each epoch, indices are shuffled within every bucket, cut into batches of
+    `batch_size` samples (or, with `max_tokens`, as many samples as fit in
+    max_tokens padded frames), and the batches of all buckets are shuffled together.
+    Padding waste of the epoch's batches is logged and kept in `epoch_stats`.
+
+    Use with DataLoader(batch_sampler=...) and call set_epoch() before each epoch
+    for a different, reproducible order.
+    """
+
+    def __init__(
+        self,
+        lengths: Sequence[int],
+        batch_size: int = 16,
+        max_tokens: Optional[int] = None,
+        num_buckets: int = 10,
+        shuffle: bool = True,
+        drop_last: bool = False,
+        seed: int = 42
+    ):
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        self.batch_size = batch_size
+        self.max_tokens = max_tokens
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.seed = seed
+        self.epoch = 0
+        self.epoch_stats: Dict[str, float] = {}
+
+        # Quantile boundaries, so buckets hold similar numbers of samples
+        num_buckets = max(1, min(num_buckets, len(self.lengths)))
+        boundaries = np.unique(np.quantile(self.lengths, np.linspace(0, 1, num_buckets + 1)[1:-1])) if len(self.lengths) else []
+        bucket_ids = np.searchsorted(boundaries, self.lengths, side='right')
+        self.buckets = [np.flatnonzero(bucket_ids == b) for b in range(len(boundaries) + 1)]
+        self.buckets = [bucket for bucket in self.buckets if len(bucket) > 0]
+
+        self._batches = self._plan_batches(np.random.default_rng(self.seed))
+
+    def set_epoch(self, epoch: int):
+        self.epoch = epoch
+        self._batches = self._plan_batches(np.random.default_rng(self.seed + epoch))
+
+    def _split_bucket(self, indices: np.ndarray) -> List[List[int]]:
+        if self.max_tokens is None:
+            batches = [indices[i:i + self.batch_size].tolist() for i in range(0, len(indices), self.batch_size)]
+            if self.drop_last and batches and len(batches[-1]) < self.batch_size:
+                batches.pop()
+            return batches
+
+        # Token cap: a batch costs len(batch) * longest sample in padded frames
+        batches = []
+        batch: List[int] = []
+        longest = 0
+        for idx in indices.tolist():
+            length = int(self.lengths[idx])
+            if batch and (len(batch) + 1) * max(longest, length) > self.max_tokens:
+                batches.append(batch)
+                batch, longest = [], 0
+            batch.append(idx)
+            longest = max(longest, length)
+        if batch and not self.drop_last:
+            batches.append(batch)
+        return batches
+
+    def _plan_batches(self, rng: np.random.Generator) -> List[List[int]]:
+        batches = []
+        for bucket in self.buckets:
+            if self.shuffle:
+                bucket = rng.permutation(bucket)
+            else:
+                # Sorted by length so each batch pads as little as possible
+                bucket = bucket[np.argsort(self.lengths[bucket], kind='stable')]
+            batches.extend(self._split_bucket(bucket))
+        if self.shuffle:
+            order = rng.permutation(len(batches))
+            batches = [batches[i] for i in order]
+        return batches
+
+    def padding_stats(self, batches: Optional[List[List[int]]] = None) -> Dict[str, float]:
+        """Real vs padded frame counts for a list of batches (default: this epoch's)"""
+        batches = self._batches if batches is None else batches
+        real = padded = 0
+        for batch in batches:
+            batch_lengths = self.lengths[batch]
+            real += int(batch_lengths.sum())
+            padded += int(batch_lengths.max()) * len(batch)
+        return {
+            'batches': len(batches),
+            'real_tokens': real,
+            'padded_tokens': padded,
+            'padding_waste': 1.0 - real / padded if padded else 0.0
+        }
+
+    def __iter__(self) -> Iterator[List[int]]:
+        batches = self._batches
+        yield from batches
+
+        self.epoch_stats = self.padding_stats(batches)
+        logger.info(
+            f"Epoch {self.epoch}: {self.epoch_stats['batches']} bucketed batches, "
+            f"padding waste {self.epoch_stats['padding_waste']:.1%} "
+            f"({self.epoch_stats['padded_tokens'] - self.epoch_stats['real_tokens']} of {self.epoch_stats['padded_tokens']} frames)"
+        )
+        # Without set_epoch calls, still reshuffle for the next pass
+        self.epoch += 1
+        self._batches = self._plan_batches(np.random.default_rng(self.seed + self.epoch))
+
+    def __len__(self) -> int:
+        return len(self._batches)
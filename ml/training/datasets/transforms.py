@@ -5,11 +5,25 @@ Video and pose transforms for sign language datasets
 import torch
 import torchvision.transforms as transforms
 from torchvision.transforms import functional as F
+from torch.nn.functional import interpolate
 import numpy as np
 from typing import Tuple, List, Optional
 import random
 
 
+def uniform_frame_indices(num_frames: int, clip_len: int) -> np.ndarray:
+    """
+    Clip sampling rule shared by training, preprocessing and serving
+    clip_len indices spread evenly over [0, num_frames - 1]; shorter videos are
+    padded with their last frame. scripts/video_sampling.py and
+    apps/backend/scripts/run_pytorch_infer.py mirror this rule
+    """
+    if num_frames <= clip_len:
+        indices = np.arange(num_frames)
+        return np.concatenate([indices, np.full(clip_len - num_frames, num_frames - 1, dtype=indices.dtype)])
+    return np.linspace(0, num_frames - 1, clip_len, dtype=int)
+
+
 class VideoTransform:
     """Video transforms for temporal-spatial augmentation"""
     
@@ -21,7 +35,8 @@ class VideoTransform:
         clip_len: int = 16,
         frame_stride: int = 2,
         temporal_jitter: bool = False,
-        rand_augment: bool = False
+        rand_augment: bool = False,
+        output_uint8: bool = False
     ):
         self.resize = resize
         self.center_crop = center_crop
@@ -30,9 +45,15 @@ class VideoTransform:
         self.frame_stride = frame_stride
         self.temporal_jitter = temporal_jitter
         self.rand_augment = rand_augment
+        # Return resized uint8 clips and leave float conversion/normalization to the
+        # device (train_loops.VideoPreprocess)
+        self.output_uint8 = output_uint8
         
         # Spatial transforms
-        if self.center_crop:
+        if self.output_uint8:
+            resize_ops = [transforms.Resize(self.resize), transforms.CenterCrop(self.resize)] if self.center_crop else [transforms.Resize((self.resize, self.resize))]
+            self.spatial_transform = transforms.Compose(resize_ops + [transforms.PILToTensor()])
+        elif self.center_crop:
             self.spatial_transform = transforms.Compose([
                 transforms.Resize(self.resize),
                 transforms.CenterCrop(self.resize),
@@ -45,6 +66,10 @@ class VideoTransform:
                 transforms.ToTensor(),
                 transforms.Normalize(mean=self.normalize[0], std=self.normalize[1])
             ])
+        
+        # Normalize constants for the tensor path, scaled by 255 so uint8 frames need no separate divide
+        self._mean = torch.tensor(self.normalize[0], dtype=torch.float32).view(1, -1, 1, 1) * 255.0
+        self._std = torch.tensor(self.normalize[1], dtype=torch.float32).view(1, -1, 1, 1) * 255.0
     
     def __call__(self, frames: List[np.ndarray]) -> torch.Tensor:
         """
@@ -52,8 +77,11 @@ class VideoTransform:
         Args:
             frames: List of PIL Images or numpy arrays (H, W, C)
         Returns:
-            Tensor of shape (T, C, H, W)
+            Tensor of shape (T, C, H, W), float32 normalized or uint8 with output_uint8
         """
+        if isinstance(frames, np.ndarray) or all(isinstance(frame, np.ndarray) for frame in frames):
+            return self._transform_arrays(frames)
+        
         from PIL import Image
         
         # Convert to PIL if needed
@@ -77,23 +105,68 @@ class VideoTransform:
         
         return video_tensor
     
-    def _temporal_sampling(self, frames: List) -> List:
-        """Uniform or jittered temporal sampling"""
-        if len(frames) <= self.clip_len:
-            # Pad or repeat
-            if len(frames) < self.clip_len:
-                frames = frames + [frames[-1]] * (self.clip_len - len(frames))
-            return frames[:self.clip_len]
+    def _transform_arrays(self, frames) -> torch.Tensor:
+        """
+        Batched tensor path for numpy frames: the whole clip is resized in one
+        interpolate call and normalized in place, with no PIL round-trip.
+        Matches the PIL pipeline up to uint8 rounding of the resized pixels.
+        """
+        clip = self._temporal_sampling(frames)
+        clip = np.stack(clip) if not isinstance(clip, np.ndarray) else clip
+        if clip.dtype != np.uint8:
+            clip = (clip * 255).astype(np.uint8)
+        
+        # (T, H, W, C) -> (T, C, H, W)
+        video = torch.from_numpy(np.ascontiguousarray(clip)).permute(0, 3, 1, 2)
+        
+        h, w = video.shape[-2:]
+        if self.center_crop:
+            # Shorter side to `resize` (transforms.Resize(int)), then center crop
+            if h <= w:
+                size = (self.resize, int(self.resize * w / h))
+            else:
+                size = (int(self.resize * h / w), self.resize)
+        else:
+            size = (self.resize, self.resize)
+        
+        if size != (h, w):
+            video = interpolate(video.float(), size=size, mode='bilinear', align_corners=False, antialias=True)
         
-        # Sample uniformly
-        indices = np.linspace(0, len(frames) - 1, self.clip_len, dtype=int)
+        if self.center_crop:
+            top = int(round((size[0] - self.resize) / 2.0))
+            left = int(round((size[1] - self.resize) / 2.0))
+            video = video[:, :, top:top + self.resize, left:left + self.resize]
+        
+        if self.output_uint8:
+            if video.dtype != torch.uint8:
+                video = video.round_().clamp_(0, 255)
+            return video.to(dtype=torch.uint8, memory_format=torch.contiguous_format)
+        
+        video = video.to(dtype=torch.float32, memory_format=torch.contiguous_format)
+        video.sub_(self._mean).div_(self._std)
+        return video
+    
+    def sample_indices(self, num_frames: int) -> np.ndarray:
+        """
+        Frame indices to keep from a video with `num_frames` frames (clip_len of them)
+        Datasets call this before decoding so only these frames are decoded
+        """
+        indices = uniform_frame_indices(num_frames, self.clip_len)
+        if num_frames <= self.clip_len:
+            return indices
         
         if self.temporal_jitter:
             # Add small random jitter
             jitter = np.random.randint(-1, 2, size=len(indices))
-            indices = np.clip(indices + jitter, 0, len(frames) - 1)
+            indices = np.clip(indices + jitter, 0, num_frames - 1)
         
-        return [frames[i] for i in indices]
+        return indices
+    
+    def _temporal_sampling(self, frames: List) -> List:
+        """Uniform or jittered temporal sampling (a no-op for already-sampled clips of clip_len frames)"""
+        if len(frames) == self.clip_len:
+            return frames
+        return [frames[i] for i in self.sample_indices(len(frames))]
 
 
 class PoseTransform:
@@ -0,0 +1,80 @@
+"""
+Video decoding shared by the video datasets
+Decodes only the frames a clip sampler asks for, instead of the whole video
+"""
+
+from typing import Callable, List, Optional, Sequence
+import cv2
+import numpy as np
+
+# Maps a video's frame count to the frame indices to keep (e.g. VideoTransform.sample_indices)
+Sampler = Callable[[int], np.ndarray]
+
+# Gaps at least this many frames long are crossed with a keyframe seek instead of grab()
+# (same value in scripts/video_sampling.py and apps/backend/scripts/run_pytorch_infer.py)
+SEEK_THRESHOLD = 120
+
+
+def read_video_frames(video_path: str, sampler: Optional[Sampler] = None) -> List[np.ndarray]:
+    """
+    Decode RGB frames from a video
+
+    Without a sampler every frame is decoded. With one, the indices are computed
+    from the container's frame count first and the stream is walked once:
+    frames in between are grab()bed (never retrieved or colour-converted) and only
+    the sampled frames are converted. Returns frames in sampler order, repeats
+    included; if the container over-reports its length, missing tail frames repeat
+    the last decoded one.
+    """
+    cap = cv2.VideoCapture(video_path)
+    frames = []
+
+    if not cap.isOpened():
+        return frames
+
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) if sampler is not None else 0
+    if total <= 0:
+        # Unknown length (or no sampler): decode everything, then sample
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        cap.release()
+        if sampler is not None and frames:
+            frames = [frames[i] for i in sampler(len(frames))]
+        return frames
+
+    indices = np.asarray(sampler(total), dtype=np.int64)
+    decoded = {}
+    position = 0
+    for target in np.unique(indices):
+        if target - position >= SEEK_THRESHOLD:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, int(target))
+            position = target
+        while position < target and cap.grab():
+            position += 1
+        ret, frame = cap.read()
+        position += 1
+        if not ret:
+            break
+        decoded[target] = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    cap.release()
+
+    if not decoded:
+        return frames
+    last = decoded[max(decoded)]
+    return [decoded.get(i, last) for i in indices]
+
+
+def load_clip_frames(video_path: str, sampler: Optional[Sampler] = None, frame_cache=None) -> Sequence[np.ndarray]:
+    """Sampled frames of one clip, from the frame cache when one is configured"""
+    if frame_cache is None:
+        return read_video_frames(video_path, sampler)
+
+    # The cache holds every frame so jittered sampling still varies per epoch;
+    # indexing the memmap reads only the sampled frames
+    frames = frame_cache.load(video_path, read_video_frames)
+    if sampler is not None and len(frames) > 0:
+        frames = frames[np.asarray(sampler(len(frames)), dtype=np.int64)]
+    return frames
@@ -5,14 +5,17 @@ WLASL (Word-Level American Sign Language) Dataset Loader
 import json
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-import cv2
+from typing import Dict, List, Optional, Sequence, Tuple
 import numpy as np
 from PIL import Image
 import torch
 from torch.utils.data import Dataset
 import logging
 
+from .frame_cache import FrameCache
+from .video_io import Sampler, load_clip_frames
+from .index_cache import cached_index, scan_class_directories
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,7 +35,10 @@ class WLASLDataset(Dataset):
         resize: int = 224,
         center_crop: bool = True,
         normalize: Optional[List[Tuple[float, float]]] = None,
-        transform=None
+        transform=None,
+        frame_cache_dir: Optional[str] = None,
+        frame_cache_max_gb: float = 50.0,
+        index_cache_dir: Optional[str] = None
     ):
         self.root = Path(root)
         self.split = split
@@ -41,6 +47,10 @@ class WLASLDataset(Dataset):
         self.resize = resize
         self.center_crop = center_crop
         self.transform = transform
+        # Opt-in: decode each video once, later epochs read resized frames from disk
+        self.frame_cache = FrameCache(frame_cache_dir, int(frame_cache_max_gb * (1 << 30)), resize) if frame_cache_dir else None
+        # Filesystem scans are cached here (default: <root>/.index_cache) and reused while their inputs are unchanged
+        self.index_cache_dir = index_cache_dir
         
         # Check if dataset exists
         if not self.root.exists():
@@ -61,43 +71,56 @@ class WLASLDataset(Dataset):
     
     def _load_from_json(self, labels_json: str):
         """Load from official WLASL JSON format"""
-        with open(labels_json, 'r') as f:
-            data = json.load(f)
+        index = cached_index(
+            'wlasl',
+            {'root': str(self.root.resolve()), 'labels_json': str(Path(labels_json).resolve())},
+            lambda: self._index_json(labels_json),
+            self.index_cache_dir,
+            dataset_root=self.root
+        )
         
         # Build label mapping
-        all_labels = sorted(set(item['gloss'] for item in data))
-        self.label_to_idx = {label: idx for idx, label in enumerate(all_labels)}
+        self.label_to_idx = {label: idx for idx, label in enumerate(index['labels'])}
         self.idx_to_label = {idx: label for label, idx in self.label_to_idx.items()}
         
         # Filter by split (if available in JSON) or use default split
         samples = []
+        for entry in index['samples']:
+            item_split = entry['split']
+            if item_split == self.split or (self.split == 'train' and item_split not in ['val', 'test']):
+                samples.append(dict(entry, label=self.label_to_idx[entry['gloss']]))
+        
+        self.samples = samples
+        logger.info(f"Loaded {len(self.samples)} WLASL samples for split '{self.split}'")
+    
+    def _index_json(self, labels_json: str):
+        """Index of the JSON's videos that exist on disk (the cached part of _load_from_json)"""
+        with open(labels_json, 'r') as f:
+            data = json.load(f)
+        
+        entries = []
+        video_dirs = set()
         for item in data:
             video_path = self.root / item['video']
+            video_dirs.add(video_path.parent)
             if video_path.exists():
-                label = item['gloss']
-                label_idx = self.label_to_idx[label]
-                
                 # Use split from JSON if available, otherwise default to train
-                item_split = item.get('split', 'train')
-                
-                if item_split == self.split or (self.split == 'train' and item_split not in ['val', 'test']):
-                    samples.append({
-                        'video': str(video_path),
-                        'label': label_idx,
-                        'gloss': label
-                    })
+                entries.append(dict(video=str(video_path), gloss=item['gloss'], split=item.get('split', 'train')))
         
-        self.samples = samples
-        logger.info(f"Loaded {len(self.samples)} WLASL samples for split '{self.split}'")
+        index = {'labels': sorted(set(item['gloss'] for item in data)), 'samples': entries}
+        return index, [labels_json] + sorted(video_dirs)
     
     def _load_from_directory(self):
         """Load from directory structure: root/class_name/*.mp4"""
-        samples = []
-        
-        # Find all class directories
-        class_dirs = [d for d in self.root.iterdir() if d.is_dir()]
-        
-        if len(class_dirs) == 0:
+        index = cached_index(
+            'wlasl',
+            {'root': str(self.root.resolve()), 'layout': 'directory'},
+            lambda: scan_class_directories(self.root, ('*.mp4', '*.avi')),
+            self.index_cache_dir,
+            dataset_root=self.root
+        )
+        
+        if len(index['labels']) == 0:
             logger.warning(f"No class directories found in {self.root}")
             self.samples = []
             self.label_to_idx = {}
@@ -105,36 +128,16 @@ class WLASLDataset(Dataset):
             return
         
         # Build label mapping from directory names
-        all_labels = sorted([d.name for d in class_dirs])
-        self.label_to_idx = {label: idx for idx, label in enumerate(all_labels)}
+        self.label_to_idx = {label: idx for idx, label in enumerate(index['labels'])}
         self.idx_to_label = {idx: label for label, idx in self.label_to_idx.items()}
         
-        # Create train/val/test split (80/10/10)
-        for label_idx, label in enumerate(all_labels):
-            class_dir = self.root / label
-            videos = list(class_dir.glob('*.mp4')) + list(class_dir.glob('*.avi'))
-            
-            if len(videos) == 0:
-                continue
-            
-            # Simple split based on hash
-            split_videos = {'train': [], 'val': [], 'test': []}
-            for video in videos:
-                hash_val = hash(video.name) % 10
-                if hash_val < 8:
-                    split_videos['train'].append(video)
-                elif hash_val < 9:
-                    split_videos['val'].append(video)
-                else:
-                    split_videos['test'].append(video)
-            
-            # Add samples for current split
-            for video in split_videos.get(self.split, []):
-                samples.append({
-                    'video': str(video),
-                    'label': label_idx,
-                    'gloss': label
-                })
+        # Create train/val/test split (80/10/10), simple split based on hash
+        samples = []
+        for entry in index['samples']:
+            hash_val = hash(Path(entry['video']).name) % 10
+            video_split = 'train' if hash_val < 8 else ('val' if hash_val < 9 else 'test')
+            if video_split == self.split:
+                samples.append(dict(entry, label=self.label_to_idx[entry['gloss']]))
         
         self.samples = samples
         logger.info(f"Loaded {len(self.samples)} WLASL samples for split '{self.split}' from directory structure")
@@ -146,17 +149,8 @@ class WLASLDataset(Dataset):
         sample = self.samples[idx]
         video_path = sample['video']
         
-        # Load video frames
-        frames = self._load_video(video_path)
-        
-        if len(frames) == 0:
-            # Return dummy data if video can't be loaded
-            logger.warning(f"Could not load video: {video_path}")
-            frames = [np.zeros((self.resize, self.resize, 3), dtype=np.uint8)] * self.clip_len
-        
-        # Apply transforms
         if self.transform:
-            frames = self.transform(frames)
+            transform = self.transform
         else:
             # Default transform
             from .transforms import VideoTransform
@@ -166,7 +160,17 @@ class WLASLDataset(Dataset):
                 clip_len=self.clip_len,
                 frame_stride=self.frame_stride
             )
-            frames = transform(frames)
+        
+        # Load only the frames the transform will keep
+        frames = self._load_video(video_path, getattr(transform, 'sample_indices', None))
+        
+        if len(frames) == 0:
+            # Return dummy data if video can't be loaded
+            logger.warning(f"Could not load video: {video_path}")
+            frames = [np.zeros((self.resize, self.resize, 3), dtype=np.uint8)] * self.clip_len
+        
+        # Apply transforms
+        frames = transform(frames)
         
         return {
             'video': frames,
@@ -175,22 +179,7 @@ class WLASLDataset(Dataset):
             'video_path': video_path
         }
     
-    def _load_video(self, video_path: str) -> List[np.ndarray]:
-        """Load video frames using OpenCV"""
-        cap = cv2.VideoCapture(video_path)
-        frames = []
-        
-        if not cap.isOpened():
-            return frames
-        
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            # Convert BGR to RGB
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frames.append(frame)
-        
-        cap.release()
-        return frames
+    def _load_video(self, video_path: str, sampler: Optional[Sampler] = None) -> Sequence[np.ndarray]:
+        """Load video frames (only the sampled ones when a sampler is given)"""
+        return load_clip_frames(video_path, sampler, self.frame_cache)
 
@@ -26,7 +26,9 @@ from training.utils.common import set_seed, get_device, setup_amp, save_checkpoi
 from training.utils.train_loops import train_epoch, validate_epoch
 from training.utils.logging import TensorBoardLogger
 from training.utils.synthetic_data import SyntheticPoseDataset
+from training.datasets.landmarks import LandmarkDataset
 from training.datasets.collate import collate_poses
+from training.datasets.sampler import BucketBatchSampler, dataset_lengths
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -101,41 +103,93 @@ def main():
     logger.info(f"Task: {task}")
     logger.info(f"Parameters: {sum(p.numel() for p in model.parameters()):,}")
     
-    # Build datasets (placeholder - in production, implement pose dataset loaders)
-    # For now, use synthetic data
-    use_synthetic = True
+    # Build datasets: memory-mapped preprocessed landmarks when data.landmarks_root is set
+    # (opt-in, null by default), synthetic data otherwise (and for --dry-run)
     data_cfg = config.get('data', {})
     model_cfg = config.get('model', {})
-    seq_len = int(data_cfg.get('clip_len', 32))
+    # data.clip_len: null keeps each clip's native length (pair with train.bucket_by_length)
+    clip_len = data_cfg.get('clip_len', 32)
+    seq_len = int(clip_len or 32)
     pose_dim = int(model_cfg.get('input_dim', 225))
     synthetic_classes = int(config.get('num_classes', 100))
+    landmarks_root = data_cfg.get('landmarks_root')
+    use_synthetic = not (landmarks_root and Path(landmarks_root).exists())
     
     if use_synthetic or args.dry_run:
         logger.warning("Using synthetic pose data for smoke test.")
         train_dataset = SyntheticPoseDataset(num_samples=16, seq_len=seq_len, features=pose_dim, num_classes=synthetic_classes)
         val_dataset = SyntheticPoseDataset(num_samples=8, seq_len=seq_len, features=pose_dim, num_classes=synthetic_classes)
     else:
-        # In production, load real pose datasets here
-        logger.error("Real pose dataset loaders not implemented. Using synthetic data.")
-        train_dataset = SyntheticPoseDataset(num_samples=16, seq_len=seq_len, features=pose_dim, num_classes=synthetic_classes)
-        val_dataset = SyntheticPoseDataset(num_samples=8, seq_len=seq_len, features=pose_dim, num_classes=synthetic_classes)
+        features = data_cfg.get('features', ['hands', 'pose'])
+        # data.window/data.stride: sliding windows over each clip (strided views of the memmap)
+        window_kwargs = {'window': data_cfg.get('window'), 'stride': data_cfg.get('stride')}
+        train_dataset = LandmarkDataset(landmarks_root, split='train', features=features, clip_len=clip_len,
+                                        **window_kwargs)
+        val_dataset = LandmarkDataset(landmarks_root, split='val', features=features, clip_len=clip_len,
+                                      label_to_idx=train_dataset.label_to_idx, **window_kwargs)
+        if len(train_dataset) == 0:
+            raise ValueError(f"No 'train' clips found under data.landmarks_root={landmarks_root}")
+        if len(val_dataset) == 0:
+            val_dataset = None
+        rebuild = False
+        if task == 'classification' and len(train_dataset.label_to_idx) != num_classes:
+            logger.warning(f"num_classes={num_classes} but found {len(train_dataset.label_to_idx)} classes; using the dataset's")
+            num_classes = synthetic_classes = len(train_dataset.label_to_idx)
+            rebuild = True
+        feature_dim = int(train_dataset[0]['pose'].shape[1])
+        if feature_dim != pose_dim:
+            logger.warning(f"Landmark features {features} are {feature_dim}-dim but model.input_dim={pose_dim}; using {feature_dim}")
+            config.setdefault('model', {})['input_dim'] = pose_dim = feature_dim
+            rebuild = True
+        if rebuild:
+            model = build_model(config, num_classes, vocab_size).to(device)
     
     # Build dataloaders
     train_config = config.get('train', {})
-    train_loader = DataLoader(
-        train_dataset,
-        batch_size=train_config.get('batch_size', 16),
-        shuffle=True,
-        num_workers=train_config.get('num_workers', 4),
-        collate_fn=collate_poses,
-        pin_memory=True
-    )
+    train_sampler = None
+    if train_config.get('bucket_by_length', False) and not (use_synthetic or args.dry_run):
+        if clip_len:
+            logger.warning("train.bucket_by_length saves no padding with a fixed data.clip_len; set data.clip_len to null")
+        # Batches of similar-length sequences; lengths come from the landmark index/headers
+        train_sampler = BucketBatchSampler(
+            dataset_lengths(train_dataset),
+            batch_size=train_config.get('batch_size', 16),
+            max_tokens=train_config.get('max_tokens'),
+            num_buckets=train_config.get('num_buckets', 10),
+            seed=config.get('seed', 42)
+        )
+        train_loader = DataLoader(
+            train_dataset,
+            batch_sampler=train_sampler,
+            num_workers=train_config.get('num_workers', 4),
+            collate_fn=collate_poses,
+            pin_memory=True
+        )
+    else:
+        train_loader = DataLoader(
+            train_dataset,
+            batch_size=train_config.get('batch_size', 16),
+            shuffle=True,
+            num_workers=train_config.get('num_workers', 4),
+            collate_fn=collate_poses,
+            pin_memory=True
+        )
     
     val_loader = None
     if val_dataset:
+        val_sampler = None
+        if train_sampler is not None:
+            val_sampler = BucketBatchSampler(
+                dataset_lengths(val_dataset),
+                batch_size=train_config.get('batch_size', 16),
+                max_tokens=train_config.get('max_tokens'),
+                num_buckets=train_config.get('num_buckets', 10),
+                shuffle=False
+            )
         val_loader = DataLoader(
             val_dataset,
-            batch_size=train_config.get('batch_size', 16),
+            batch_size=1 if val_sampler else train_config.get('batch_size', 16),
+            batch_sampler=val_sampler,
             shuffle=False,
             num_workers=train_config.get('num_workers', 4),
             collate_fn=collate_poses,
@@ -253,6 +307,8 @@ def main():
     
     for epoch in range(epochs):
         logger.info(f"Epoch {epoch+1}/{epochs}")
+        if train_sampler is not None:
+            train_sampler.set_epoch(epoch)
         
         # Train
         model.train()
@@ -265,7 +321,7 @@ def main():
             labels = batch['label'].to(device)
             
             optimizer.zero_grad()
-            out = model(poses)
+            out = model(poses, batch['lengths'].to(device))
             logits = out.get('logits', out.get('classification', out))
             if isinstance(logits, dict):
                 logits = logits.get('logits', list(logits.values())[0])
@@ -291,7 +347,7 @@ def main():
                 for batch in val_loader:
                     poses = batch['pose'].to(device)
                     labels = batch['label'].to(device)
-                    out = model(poses)
+                    out = model(poses, batch['lengths'].to(device))
                     logits = out.get('logits', out.get('classification', out))
                     if isinstance(logits, dict):
                         logits = logits.get('logits', list(logits.values())[0])
@@ -28,7 +28,7 @@ from training.datasets.transforms import VideoTransform
 from training.datasets.collate import collate_video
 from training.models import VideoSwinModel
 from training.utils.common import set_seed, get_device, setup_amp, save_checkpoint, load_checkpoint
-from training.utils.train_loops import train_epoch, validate_epoch
+from training.utils.train_loops import train_epoch, validate_epoch, VideoPreprocess
 from training.utils.logging import TensorBoardLogger
 from training.utils.metrics import accuracy_topk
 from training.utils.synthetic_data import SyntheticVideoDataset
@@ -64,7 +64,9 @@ def build_datasets(config: Dict[str, Any], split: str) -> List[torch.utils.data.
             center_crop=data_config.get('center_crop', True),
             clip_len=data_config.get('clip_len', 16),
             frame_stride=data_config.get('frame_stride', 2),
-            normalize=data_config.get('normalize', None)
+            normalize=data_config.get('normalize', None),
+            # Normalization then happens on the device (VideoPreprocess)
+            output_uint8=config.get('train', {}).get('device_preprocess', False)
         )
         
         try:
@@ -222,6 +224,14 @@ def main():
         return { 'video': videos, 'label': labels }
 
     collate_fn = _default_collate if use_synthetic else collate_video
+    
+    # uint8 batches from the datasets are converted, normalized and (train.augment, off by
+    # default) augmented on the device; validation and --eval-only never augment
+    preprocess = eval_preprocess = None
+    if train_config.get('device_preprocess', False) and not use_synthetic:
+        normalize = config.get('data', {}).get('normalize', None)
+        preprocess = VideoPreprocess(normalize=normalize, augment=train_config.get('augment', False)).to(device)
+        eval_preprocess = VideoPreprocess(normalize=normalize, augment=False).to(device)
 
     train_loader = DataLoader(
         train_dataset,
@@ -295,7 +305,7 @@ def main():
         
         if val_loader:
             criterion = nn.CrossEntropyLoss()
-            metrics = validate_epoch(model, val_loader, criterion, device, task)
+            metrics = validate_epoch(model, val_loader, criterion, device, task, preprocess=eval_preprocess)
             logger.info(f"Validation metrics: {metrics}")
         return
     
@@ -350,7 +360,8 @@ def main():
             device,
             scaler,
             task,
-            loss_weights=config.get('loss_weights', {'classification': 1.0, 'ctc': 0.7, 'seq2seq': 0.7})
+            loss_weights=config.get('loss_weights', {'classification': 1.0, 'ctc': 0.7, 'seq2seq': 0.7}),
+            preprocess=preprocess
         )
         
         logger.info(f"Train metrics: {train_metrics}")
@@ -358,7 +369,7 @@ def main():
         
         # Validate
         if val_loader:
-            val_metrics = validate_epoch(model, val_loader, criterion, device, task)
+            val_metrics = validate_epoch(model, val_loader, criterion, device, task, preprocess=eval_preprocess)
             logger.info(f"Val metrics: {val_metrics}")
             logger_tb.log_dict(val_metrics, epoch, 'val')
             
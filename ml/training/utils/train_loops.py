@@ -5,7 +5,7 @@ Shared training and validation loops
 import torch
 import torch.nn as nn
 from torch.utils.data import DataLoader
-from typing import Dict, Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
 import logging
 from tqdm import tqdm
 
@@ -15,6 +15,58 @@ from .metrics import accuracy_topk, compute_wer, compute_cer, gloss_accuracy
 logger = logging.getLogger(__name__)
 
 
+class VideoPreprocess(nn.Module):
+    """
+    Device-side preprocessing for uint8 video batches
+    Pair with VideoTransform(output_uint8=True): workers then ship uint8 (B, T, C, H, W)
+    batches (4x fewer bytes than float32 through IPC and pinned memory), and float
+    conversion, normalization and augmentation run once per batch on the device.
+    Float batches are assumed to be preprocessed already and pass through unchanged.
+    """
+    
+    def __init__(
+        self,
+        normalize: Optional[List[Tuple[float, float]]] = None,
+        augment: bool = False,
+        brightness: float = 0.2,
+        contrast: float = 0.2,
+        flip_prob: float = 0.0
+    ):
+        super().__init__()
+        mean, std = normalize or ([0.485, 0.456, 0.406], [0.229, 0.224, 0.225])
+        # Scaled by 255 so uint8 input needs no separate divide
+        self.register_buffer('mean', torch.tensor(mean, dtype=torch.float32).view(1, 1, -1, 1, 1) * 255.0)
+        self.register_buffer('std', torch.tensor(std, dtype=torch.float32).view(1, 1, -1, 1, 1) * 255.0)
+        self.augment = augment
+        self.brightness = brightness
+        self.contrast = contrast
+        # Off by default: mirroring swaps the signing hand
+        self.flip_prob = flip_prob
+    
+    def forward(self, video: torch.Tensor) -> torch.Tensor:
+        if video.dtype != torch.uint8:
+            return video
+        
+        video = video.float()
+        
+        if self.training and self.augment:
+            # Per-clip colour jitter, same factors for every frame of a clip
+            shape = (video.shape[0], 1, 1, 1, 1)
+            if self.contrast > 0:
+                factor = torch.empty(shape, device=video.device).uniform_(1 - self.contrast, 1 + self.contrast)
+                clip_mean = video.mean(dim=(1, 2, 3, 4), keepdim=True)
+                video = video.sub_(clip_mean).mul_(factor).add_(clip_mean)
+            if self.brightness > 0:
+                factor = torch.empty(shape, device=video.device).uniform_(1 - self.brightness, 1 + self.brightness)
+                video = video.mul_(factor)
+            video = video.clamp_(0, 255)
+            if self.flip_prob > 0:
+                flip = torch.rand(shape, device=video.device) < self.flip_prob
+                video = torch.where(flip, video.flip(-1), video)
+        
+        return video.sub_(self.mean).div_(self.std)
+
+
 def train_epoch(
     model: nn.Module,
     dataloader: DataLoader,
@@ -24,12 +76,16 @@ def train_epoch(
     scaler: Optional[torch.cuda.amp.GradScaler] = None,
     task: str = "classification",
     max_grad_norm: float = 1.0,
-    loss_weights: Optional[Dict[str, float]] = None
+    loss_weights: Optional[Dict[str, float]] = None,
+    preprocess: Optional[nn.Module] = None
 ) -> Dict[str, float]:
     """
     Training loop for one epoch
+    `preprocess` (e.g. VideoPreprocess) runs on each video batch after it is moved to the device
     """
     model.train()
+    if preprocess is not None:
+        preprocess.train()
     total_loss = 0.0
     total_samples = 0
     
@@ -48,8 +104,10 @@ def train_epoch(
     
     for batch_idx, batch in enumerate(pbar):
         # Move to device
-        video = batch['video'].to(device)
+        video = batch['video'].to(device, non_blocking=True)
         labels = batch['label'].to(device)
+        if preprocess is not None:
+            video = preprocess(video)
         
         # Forward pass
         optimizer.zero_grad()
@@ -152,12 +210,15 @@ def validate_epoch(
     criterion: nn.Module,
     device: torch.device,
     task: str = "classification",
-    idx_to_label: Optional[Dict[int, str]] = None
+    idx_to_label: Optional[Dict[int, str]] = None,
+    preprocess: Optional[nn.Module] = None
 ) -> Dict[str, float]:
     """
     Validation loop
     """
     model.eval()
+    if preprocess is not None:
+        preprocess.eval()
     total_loss = 0.0
     total_samples = 0
     
@@ -174,8 +235,10 @@ def validate_epoch(
     
     with torch.no_grad():
         for batch in tqdm(dataloader, desc="Validation"):
-            video = batch['video'].to(device)
+            video = batch['video'].to(device, non_blocking=True)
             labels = batch['label'].to(device)
+            if preprocess is not None:
+                video = preprocess(video)
             
             outputs = model(video)
             
@@ -56,7 +56,9 @@ class LandmarkDataset:
         if not landmarks_path.exists():
             raise FileNotFoundError(f"Landmarks not found: {landmarks_path}")
         
-        landmarks = np.load(str(landmarks_path))  # Shape: [T, features]
+        landmarks = np.load(str(landmarks_path))  # Shape: [T, features] or per-frame [T, 543, 3]
+        if landmarks.ndim > 2:
+            landmarks = landmarks.reshape(len(landmarks), -1)
         return landmarks
     
     def pad_or_trim(self, landmarks: np.ndarray):
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+MediaPipe landmark protobufs -> NumPy, shared by the preprocessing scripts.
+
+Landmarks are copied column by column (np.fromiter over the repeated field)
+straight into a preallocated float32 slot, so no per-landmark Python lists or
+intermediate arrays are created.
+
+Holistic frame layout (543, 3):
+  [0:33]    pose
+  [33:54]   left hand
+  [54:75]   right hand
+  [75:543]  face mesh
+
+Benchmark (needs mediapipe for the protobuf types):
+    python scripts/landmark_arrays.py --benchmark
+"""
+
+import argparse
+import json
+import time
+from operator import attrgetter
+
+import numpy as np
+
+POSE_LANDMARKS = 33
+HAND_LANDMARKS = 21
+FACE_LANDMARKS = 468
+HOLISTIC_LANDMARKS = POSE_LANDMARKS + 2 * HAND_LANDMARKS + FACE_LANDMARKS  # 543
+
+POSE_SLICE = slice(0, 33)
+LEFT_HAND_SLICE = slice(33, 54)
+RIGHT_HAND_SLICE = slice(54, 75)
+FACE_SLICE = slice(75, 543)
+
+_GET_X = attrgetter("x")
+_GET_Y = attrgetter("y")
+_GET_Z = attrgetter("z")
+
+
+def fill_landmarks(out: np.ndarray, landmark_list) -> None:
+    """Copy a (Normalized)LandmarkList into `out` (N, 3); zero it when not detected."""
+    if landmark_list is None:
+        out[:] = 0.0
+        return
+    landmarks = landmark_list.landmark
+    n = min(len(landmarks), len(out))
+    out[:n, 0] = np.fromiter(map(_GET_X, landmarks), dtype=np.float32, count=n)
+    out[:n, 1] = np.fromiter(map(_GET_Y, landmarks), dtype=np.float32, count=n)
+    out[:n, 2] = np.fromiter(map(_GET_Z, landmarks), dtype=np.float32, count=n)
+    out[n:] = 0.0
+
+
+def fill_holistic_frame(out: np.ndarray, result) -> np.ndarray:
+    """Write a Holistic result into a (543, 3) float32 slot, e.g. one row of a (T, 543, 3) buffer."""
+    fill_landmarks(out[POSE_SLICE], result.pose_landmarks)
+    fill_landmarks(out[LEFT_HAND_SLICE], result.left_hand_landmarks)
+    fill_landmarks(out[RIGHT_HAND_SLICE], result.right_hand_landmarks)
+    fill_landmarks(out[FACE_SLICE], result.face_landmarks)
+    return out
+
+
+def fill_hands_pose_frame(out: np.ndarray, hands_result, pose_result=None) -> np.ndarray:
+    """Write Hands (+ optional Pose) results into a (42, 3) or (75, 3) float32 slot.
+
+    Up to two hands in detection order, zero-padded to 42 rows, then 33 pose rows
+    if `out` has room for them.
+    """
+    hands = hands_result.multi_hand_landmarks or []
+    for i in range(2):
+        fill_landmarks(out[i * HAND_LANDMARKS:(i + 1) * HAND_LANDMARKS], hands[i] if i < len(hands) else None)
+    if len(out) > 2 * HAND_LANDMARKS:
+        fill_landmarks(out[2 * HAND_LANDMARKS:], pose_result.pose_landmarks if pose_result else None)
+    return out
+
+
+def _loop_convert(landmark_list) -> np.ndarray:
+    """The per-landmark list conversion the scripts used before this module"""
+    arr = []
+    for lm in landmark_list.landmark:
+        arr.append([lm.x, lm.y, lm.z])
+    return np.asarray(arr, dtype=np.float32)
+
+
+def benchmark(repeats: int = 2000) -> dict:
+    """Median per-frame conversion time for a full Holistic frame (pose + 2 hands + face)"""
+    from types import SimpleNamespace
+    from mediapipe.framework.formats import landmark_pb2
+
+    rng = np.random.default_rng(0)
+
+    def landmark_list(n):
+        message = landmark_pb2.NormalizedLandmarkList()
+        for x, y, z in rng.random((n, 3)):
+            message.landmark.add(x=x, y=y, z=z)
+        return message
+
+    result = SimpleNamespace(
+        pose_landmarks=landmark_list(POSE_LANDMARKS),
+        left_hand_landmarks=landmark_list(HAND_LANDMARKS),
+        right_hand_landmarks=landmark_list(HAND_LANDMARKS),
+        face_landmarks=landmark_list(FACE_LANDMARKS)
+    )
+
+    def loop():
+        return np.concatenate([
+            _loop_convert(result.pose_landmarks),
+            _loop_convert(result.left_hand_landmarks),
+            _loop_convert(result.right_hand_landmarks),
+            _loop_convert(result.face_landmarks)
+        ], axis=0)
+
+    slot = np.empty((HOLISTIC_LANDMARKS, 3), dtype=np.float32)
+    assert np.array_equal(loop(), fill_holistic_frame(slot, result))
+
+    def median_us(fn) -> float:
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1e6)
+        return round(float(np.median(samples)), 2)
+
+    loop_us = median_us(loop)
+    fill_us = median_us(lambda: fill_holistic_frame(slot, result))
+    return {
+        "landmarks_per_frame": HOLISTIC_LANDMARKS,
+        "repeats": repeats,
+        "loop_us_per_frame": loop_us,
+        "fill_us_per_frame": fill_us,
+        "speedup": round(loop_us / fill_us, 2) if fill_us else None
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Landmark conversion helpers")
+    parser.add_argument("--benchmark", action="store_true", help="Time loop conversion vs fill_holistic_frame")
+    parser.add_argument("--repeats", type=int, default=2000)
+    args = parser.parse_args()
+    if args.benchmark:
+        print(json.dumps(benchmark(args.repeats), indent=2))
+    else:
+        parser.print_help()
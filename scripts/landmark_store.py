@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Sharded, memory-mappable landmark store.
+
+Instead of one directory (landmarks.npy + metadata.json + JPEGs) per clip, all
+clips are appended to a few large .npy shards and described by one index table:
+
+  <store>/shard_00000.npy   (N_frames, *frame_shape) float32
+  <store>/shard_00001.npy
+  <store>/index.csv         clip_id,class_name,split,shard,start,length,fps
+
+A clip never spans shards. LandmarkStore memory-maps the shards, so reading any
+clip is an O(1) slice of a memmap with no copy and no per-clip file open.
+
+Write directly with LandmarkStoreWriter (preprocess script, --sharded) or pack
+an existing per-clip tree:
+    python scripts/landmark_store.py pack data/processed data/landmark_store
+"""
+
+import argparse
+import csv
+import json
+import struct
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+INDEX_NAME = "index.csv"
+INDEX_FIELDS = ["clip_id", "class_name", "split", "shard", "start", "length", "fps"]
+DEFAULT_SHARD_BYTES = 1 << 31  # 2 GiB
+# Fixed .npy header size so the final shape can be written in place once the shard is closed
+NPY_HEADER_SIZE = 128
+
+
+def _npy_header(shape: tuple, dtype: np.dtype) -> bytes:
+    header = "{'descr': %r, 'fortran_order': False, 'shape': %r, }" % (np.dtype(dtype).str, tuple(shape))
+    header = header.ljust(NPY_HEADER_SIZE - 10 - 1) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1")
+
+
+class LandmarkStoreWriter:
+    """Append clips to size-capped .npy shards; close() finalizes shard headers and the index."""
+
+    def __init__(self, root: Path, shard_bytes: int = DEFAULT_SHARD_BYTES, dtype=np.float32):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.shard_bytes = shard_bytes
+        self.dtype = np.dtype(dtype)
+        self.frame_shape = None
+        self.rows: List[dict] = []
+        self._file = None
+        self._shard = -1
+        self._frames = 0
+
+    def _shard_path(self, shard: int) -> Path:
+        return self.root / f"shard_{shard:05d}.npy"
+
+    def _open_shard(self):
+        self._close_shard()
+        self._shard += 1
+        self._frames = 0
+        self._file = self._shard_path(self._shard).open("wb")
+        self._file.write(_npy_header((0, *self.frame_shape), self.dtype))
+
+    def _close_shard(self):
+        if self._file is None:
+            return
+        self._file.seek(0)
+        self._file.write(_npy_header((self._frames, *self.frame_shape), self.dtype))
+        self._file.close()
+        self._file = None
+
+    def add(self, clip_id: str, landmarks: np.ndarray, class_name: str = "unknown",
+            split: str = "unknown", fps: float = 0.0):
+        landmarks = np.ascontiguousarray(landmarks, dtype=self.dtype)
+        if self.frame_shape is None:
+            self.frame_shape = landmarks.shape[1:]
+        elif landmarks.shape[1:] != self.frame_shape:
+            raise ValueError(f"{clip_id}: frame shape {landmarks.shape[1:]} != store frame shape {self.frame_shape}")
+
+        frame_bytes = int(np.prod(self.frame_shape, dtype=np.int64)) * self.dtype.itemsize
+        if self._file is None or (self._frames and (self._frames + len(landmarks)) * frame_bytes > self.shard_bytes):
+            self._open_shard()
+
+        self._file.write(landmarks.tobytes())
+        self.rows.append({
+            "clip_id": clip_id,
+            "class_name": class_name,
+            "split": split,
+            "shard": self._shard,
+            "start": self._frames,
+            "length": len(landmarks),
+            "fps": fps
+        })
+        self._frames += len(landmarks)
+
+    def close(self):
+        self._close_shard()
+        with (self.root / INDEX_NAME).open("w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=INDEX_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.rows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LandmarkStore:
+    """Read-only view of a store: store[i] / store.get(clip_id) return zero-copy memmap slices."""
+
+    def __init__(self, root: Path, split: Optional[str] = None):
+        self.root = Path(root)
+        with (self.root / INDEX_NAME).open("r", newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        self.entries = [
+            {
+                "clip_id": row["clip_id"],
+                "class_name": row["class_name"],
+                "split": row["split"],
+                "shard": int(row["shard"]),
+                "start": int(row["start"]),
+                "length": int(row["length"]),
+                "fps": float(row["fps"])
+            }
+            for row in rows if split is None or row["split"] == split
+        ]
+        self._by_id: Dict[str, int] = {entry["clip_id"]: i for i, entry in enumerate(self.entries)}
+        self._shards: Dict[int, np.ndarray] = {}
+
+    def shard(self, shard: int) -> np.ndarray:
+        # Opened lazily, so DataLoader workers map the shards after fork
+        if shard not in self._shards:
+            self._shards[shard] = np.load(self.root / f"shard_{shard:05d}.npy", mmap_mode="r")
+        return self._shards[shard]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __getitem__(self, idx: int) -> np.ndarray:
+        entry = self.entries[idx]
+        return self.shard(entry["shard"])[entry["start"]:entry["start"] + entry["length"]]
+
+    def get(self, clip_id: str) -> np.ndarray:
+        return self[self._by_id[clip_id]]
+
+
+def pack(processed_dir: Path, store_dir: Path, shard_bytes: int = DEFAULT_SHARD_BYTES) -> int:
+    """Pack a per-clip tree (<split>/<class>/<clip_id>/landmarks.npy or <class>/<clip_id>/...) into a store"""
+    processed_dir = Path(processed_dir)
+    count = 0
+    with LandmarkStoreWriter(store_dir, shard_bytes) as writer:
+        for landmarks_path in sorted(processed_dir.rglob("landmarks.npy")):
+            clip_dir = landmarks_path.parent
+            parts = clip_dir.relative_to(processed_dir).parts
+            metadata = {}
+            if (clip_dir / "metadata.json").exists():
+                metadata = json.loads((clip_dir / "metadata.json").read_text(encoding="utf-8"))
+            writer.add(
+                metadata.get("clip_id", clip_dir.name),
+                np.load(landmarks_path),
+                class_name=metadata.get("class_name", parts[-2] if len(parts) >= 2 else "unknown"),
+                split=parts[-3] if len(parts) >= 3 else "unknown",
+                fps=metadata.get("fps") or 0.0
+            )
+            count += 1
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sharded landmark store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    pack_parser = subparsers.add_parser("pack", help="Pack per-clip landmarks.npy files into shards")
+    pack_parser.add_argument("processed_dir", type=Path)
+    pack_parser.add_argument("store_dir", type=Path)
+    pack_parser.add_argument("--shard-mb", type=int, default=DEFAULT_SHARD_BYTES >> 20, help="Max shard size in MiB")
+    args = parser.parse_args()
+
+    packed = pack(args.processed_dir, args.store_dir, args.shard_mb << 20)
+    print(f"Packed {packed} clips into {args.store_dir}")
+    sys.exit(0)
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Extract frames and landmarks from video datasets for sign language training.
+Supports: WLASL, RWTH-PHOENIX, ASLLVD, Custom CSV format
+
+Samples --frames-per-clip frames per video and runs MediaPipe Hands (+ Pose)
+on them; for per-frame Holistic landmarks of every video under data/raw use
+preprocess_extract_frames_and_landmarks.py instead.
+
+Usage:
+    python scripts/preprocess_dataset_clips.py \
+        --input-dir ./data/raw \
+        --output-dir ./data/processed \
+        --frames-per-clip 32 \
+        --dataset-format wlasl
+"""
+
+import argparse
+import json
+from pathlib import Path
+import cv2
+import numpy as np
+import mediapipe as mp
+from tqdm import tqdm
+import pandas as pd
+from typing import List, Tuple, Dict
+
+from landmark_arrays import fill_hands_pose_frame
+from video_sampling import read_frames_at, sample_frame_indices
+from landmark_store import LandmarkStoreWriter
+# MediaPipe setup
+mp_hands = mp.solutions.hands
+mp_pose = mp.solutions.pose
+mp_drawing = mp.solutions.drawing_utils
+
+
+def extract_landmarks_from_frame(frame_rgb, hands_detector, pose_detector=None):
+    """
+    Extract hand and pose landmarks from a single frame.
+    
+    Returns:
+        features: float32 vector of 42 hand landmarks (2 hands, zero-padded)
+        followed by 33 pose landmarks when pose_detector is given, flattened
+    """
+    results_hands = hands_detector.process(frame_rgb)
+    results_pose = pose_detector.process(frame_rgb) if pose_detector else None
+    
+    num_landmarks = 42 + (33 if pose_detector else 0)
+    features = np.empty((num_landmarks, 3), dtype=np.float32)
+    fill_hands_pose_frame(features, results_hands, results_pose)
+    
+    return features.reshape(-1)
+
+
+def extract_frames_from_video(video_path: Path, frames_per_clip: int = 32) -> Tuple[List[np.ndarray], float]:
+    """
+    Extract uniformly sampled frames from video.
+    
+    Frames are decoded in one sequential pass (skipped frames are grabbed,
+    not retrieved); see scripts/video_sampling.py.
+    
+    Returns:
+        frames: List of RGB frames (H, W, 3)
+        fps: Video FPS
+    """
+    cap = cv2.VideoCapture(str(video_path))
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    
+    if total_frames == 0:
+        return [], fps
+    
+    # Sample frame indices uniformly (padded with the last frame if needed)
+    indices = sample_frame_indices(total_frames, frames_per_clip)
+    
+    frames = []
+    for frame in read_frames_at(cap, indices):
+        frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    
+    cap.release()
+    return frames, fps
+
+
+class LandmarkDetectors:
+    """
+    MediaPipe Hands (+ optional Pose) built once and reused for every clip.
+    
+    Graph initialization costs more than the inference itself on short clips,
+    so the detectors live for the whole run and reset() only restarts their
+    tracking state between clips.
+    """
+    
+    def __init__(self, extract_pose: bool = False):
+        self.extract_pose = extract_pose
+        self._build()
+    
+    def _build(self):
+        self.hands = mp_hands.Hands(
+            static_image_mode=False,
+            max_num_hands=2,
+            min_detection_confidence=0.5
+        )
+        self.pose = mp_pose.Pose() if self.extract_pose else None
+    
+    def reset(self):
+        """Forget tracked landmarks from the previous clip"""
+        detectors = [d for d in (self.hands, self.pose) if d is not None]
+        if all(hasattr(d, 'reset') for d in detectors):
+            for detector in detectors:
+                detector.reset()
+        else:
+            # Older mediapipe without SolutionBase.reset(): rebuild instead
+            self.close()
+            self._build()
+    
+    def close(self):
+        self.hands.close()
+        if self.pose:
+            self.pose.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+def process_video_clip(
+    video_path: Path,
+    output_dir: Path,
+    clip_id: str,
+    class_name: str,
+    frames_per_clip: int = 32,
+    extract_pose: bool = False,
+    detectors: LandmarkDetectors = None,
+    store: LandmarkStoreWriter = None,
+    split: str = 'unknown'
+):
+    """
+    Process a single video clip: extract frames and landmarks.
+    
+    Pass a long-lived `detectors` to reuse the MediaPipe graphs across clips
+    (it is reset here); otherwise a temporary one is built for this clip.
+    With a `store`, landmarks are appended to its shards and no per-clip
+    directory, JPEGs or metadata.json are written.
+    """
+    # Create output directories
+    clip_dir = output_dir / class_name / clip_id
+    frames_dir = clip_dir / 'frames'
+    if store is None:
+        frames_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Extract frames
+    frames, fps = extract_frames_from_video(video_path, frames_per_clip)
+    
+    if len(frames) == 0:
+        print(f"⚠️ Warning: No frames extracted from {video_path}")
+        return None
+    
+    # Initialize MediaPipe (or restart tracking on the shared detectors)
+    own_detectors = detectors is None
+    if own_detectors:
+        detectors = LandmarkDetectors(extract_pose)
+    else:
+        detectors.reset()
+    
+    # Extract landmarks per frame
+    landmarks_sequence = []
+    try:
+        for i, frame in enumerate(frames):
+            # Save frame as JPEG
+            if store is None:
+                frame_path = frames_dir / f'frame_{i:04d}.jpg'
+                frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+                cv2.imwrite(str(frame_path), frame_bgr)
+            
+            # Extract landmarks
+            landmarks = extract_landmarks_from_frame(frame, detectors.hands, detectors.pose)
+            landmarks_sequence.append(landmarks)
+    finally:
+        if own_detectors:
+            detectors.close()
+    
+    landmarks_array = np.array(landmarks_sequence)
+    metadata = {
+        'clip_id': clip_id,
+        'class_name': class_name,
+        'frames_count': len(frames),
+        'fps': fps,
+        'landmarks_shape': landmarks_array.shape,
+        'source_video': str(video_path)
+    }
+    
+    if store is not None:
+        store.add(clip_id, landmarks_array, class_name=class_name, split=split, fps=fps)
+        return metadata
+    
+    # Save landmarks as .npy
+    landmarks_path = clip_dir / 'landmarks.npy'
+    np.save(str(landmarks_path), landmarks_array)
+    
+    # Save metadata
+    metadata_path = clip_dir / 'metadata.json'
+    with open(metadata_path, 'w') as f:
+        json.dump(metadata, f, indent=2)
+    
+    return metadata
+
+
+def load_wlasl_labels(input_dir: Path) -> Dict[str, str]:
+    """
+    Load WLASL dataset labels.
+    Expected structure: input_dir/videos/{class_name}/*.mp4
+    """
+    labels = {}
+    videos_dir = input_dir / 'videos'
+    
+    if not videos_dir.exists():
+        raise ValueError(f"WLASL videos directory not found: {videos_dir}")
+    
+    for class_dir in videos_dir.iterdir():
+        if class_dir.is_dir():
+            class_name = class_dir.name
+            for video_file in class_dir.glob('*.mp4'):
+                labels[str(video_file)] = class_name
+    
+    return labels
+
+
+def load_phoenix_labels(input_dir: Path) -> Dict[str, str]:
+    """
+    Load RWTH-PHOENIX dataset labels.
+    Expected: input_dir/phoenix2014-release/{split}/signs/*.mp4
+    """
+    labels = {}
+    phoenix_dir = input_dir / 'phoenix2014-release'
+    
+    if not phoenix_dir.exists():
+        raise ValueError(f"Phoenix directory not found: {phoenix_dir}")
+    
+    # The *.corpus.csv annotations are not parsed yet (format-specific);
+    # labels come from the directory structure
+    for split in ['train', 'dev', 'test']:
+        signs_dir = phoenix_dir / split / 'signs'
+        if signs_dir.exists():
+            for video_file in signs_dir.glob('*.mp4'):
+                # Extract label from filename or directory structure
+                class_name = video_file.parent.name  # Adjust based on structure
+                labels[str(video_file)] = class_name
+    
+    return labels
+
+
+def load_csv_labels(csv_path: Path) -> Dict[str, str]:
+    """
+    Load labels from custom CSV file.
+    Expected format: video_path,label
+    """
+    df = pd.read_csv(csv_path)
+    labels = {}
+    
+    for _, row in df.iterrows():
+        video_path = Path(row['video_path'])
+        label = row['label']
+        labels[str(video_path.resolve())] = label
+    
+    return labels
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract frames and landmarks from video datasets')
+    parser.add_argument('--input-dir', required=True, type=Path, help='Input directory with videos')
+    parser.add_argument('--output-dir', required=True, type=Path, help='Output directory for processed data')
+    parser.add_argument('--frames-per-clip', type=int, default=32, help='Number of frames per clip')
+    parser.add_argument('--dataset-format', choices=['wlasl', 'phoenix', 'csv', 'custom'], default='custom',
+                        help='Dataset format')
+    parser.add_argument('--labels-csv', type=Path, help='CSV file with video_path,label columns (for csv/custom format)')
+    parser.add_argument('--extract-pose', action='store_true', help='Also extract pose landmarks')
+    parser.add_argument('--split', choices=['train', 'val', 'test'], help='Dataset split (optional)')
+    parser.add_argument('--sharded', action='store_true',
+                        help='Write landmarks to large memory-mappable shards + index.csv instead of one directory per clip')
+    
+    args = parser.parse_args()
+    
+    # Load labels based on dataset format
+    print(f"📂 Loading labels from {args.dataset_format} format...")
+    if args.dataset_format == 'wlasl':
+        labels = load_wlasl_labels(args.input_dir)
+    elif args.dataset_format == 'phoenix':
+        labels = load_phoenix_labels(args.input_dir)
+    elif args.labels_csv:
+        labels = load_csv_labels(args.labels_csv)
+    else:
+        # Custom: assume structure input_dir/{class_name}/*.mp4
+        labels = {}
+        for class_dir in args.input_dir.iterdir():
+            if class_dir.is_dir():
+                class_name = class_dir.name
+                for video_file in class_dir.glob('*.mp4'):
+                    labels[str(video_file)] = class_name
+    
+    print(f"✅ Loaded configurations for {len(labels)} videos")
+    
+    # Create output directory structure
+    if args.split:
+        output_base = args.output_dir / args.split
+    else:
+        output_base = args.output_dir
+    
+    output_base.mkdir(parents=True, exist_ok=True)
+    
+    # Process each video
+    failed = []
+    successful = []
+    
+    store = LandmarkStoreWriter(output_base / 'landmark_store') if args.sharded else None
+    
+    # One set of MediaPipe graphs for the whole run, reset between clips
+    with LandmarkDetectors(args.extract_pose) as detectors:
+        for video_path_str, class_name in tqdm(labels.items(), desc="Processing videos"):
+            video_path = Path(video_path_str)
+            
+            if not video_path.exists():
+                print(f"⚠️ Video not found: {video_path}")
+                failed.append(video_path)
+                continue
+            
+            clip_id = video_path.stem
+            try:
+                metadata = process_video_clip(
+                    video_path,
+                    output_base,
+                    clip_id,
+                    class_name,
+                    args.frames_per_clip,
+                    args.extract_pose,
+                    detectors=detectors,
+                    store=store,
+                    split=args.split or 'unknown'
+                )
+                if metadata:
+                    successful.append(metadata)
+            except Exception as e:
+                print(f"❌ Error processing {video_path}: {e}")
+                failed.append(video_path)
+    
+    if store is not None:
+        # The store's index.csv replaces labels.csv
+        store.close()
+        print(f"✅ Saved landmark store: {store.root}")
+    else:
+        # Generate labels.csv for training
+        labels_csv_path = output_base / 'labels.csv'
+        rows = []
+        for metadata in successful:
+            rows.append({
+                'clip_id': metadata['clip_id'],
+                'class_name': metadata['class_name'],
+                'clip_path': str(output_base / metadata['class_name'] / metadata['clip_id']),
+                'split': args.split or 'unknown'
+            })
+        
+        labels_df = pd.DataFrame(rows)
+        labels_df.to_csv(labels_csv_path, index=False)
+        print(f"✅ Saved labels CSV: {labels_csv_path}")
+    
+    print("\n📊 Summary:")
+    print(f"  ✅ Successful: {len(successful)}")
+    print(f"  ❌ Failed: {len(failed)}")
+    
+    if failed:
+        print("\n⚠️ Failed videos:")
+        for path in failed[:10]:  # Show first 10
+            print(f"    {path}")
+
+
+if __name__ == '__main__':
+    main()
+
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Uniform frame sampling without per-frame seeks, shared by the preprocessing scripts.
+
+`cap.set(cv2.CAP_PROP_POS_FRAMES, idx)` makes the decoder jump back to the
+previous keyframe and decode forward again, so on long-GOP codecs (H.264/HEVC/
+VP9) seeking to every sampled index decodes most frames several times.
+read_frames_at() instead walks the stream once: frames between targets are
+grab()bed (demuxed + decoded, but never retrieved/converted) and only the
+targets are retrieved. A seek is used only when the gap to the next target is
+at least `seek_threshold` frames, where one keyframe seek is cheaper than
+grabbing through the gap.
+
+Benchmark the strategies on your own files (one per codec):
+    python scripts/video_sampling.py --benchmark a_h264.mp4 b_vp9.webm c_mjpeg.avi
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+# Gaps at least this many frames long are crossed with a keyframe seek
+# (same value as ml/training/datasets/video_io.py)
+SEEK_THRESHOLD = 120
+
+
+def sample_frame_indices(total_frames: int, frames_per_clip: int) -> List[int]:
+    """
+    Uniformly spaced indices over [0, total_frames - 1]; short videos are padded with the last frame.
+    Same rule as uniform_frame_indices in ml/training/datasets/transforms.py, so preprocessed
+    clips hold the frames training and serving would sample.
+    """
+    if total_frames <= frames_per_clip:
+        return list(range(total_frames)) + [total_frames - 1] * (frames_per_clip - total_frames)
+    return np.linspace(0, total_frames - 1, frames_per_clip, dtype=int).tolist()
+
+
+def read_frames_at(cap, indices: List[int], seek_threshold: Optional[int] = SEEK_THRESHOLD) -> List[np.ndarray]:
+    """
+    Decode the BGR frames at sorted `indices` in one forward pass.
+
+    Repeated indices reuse the previous frame. `seek_threshold=None` never seeks,
+    and 0 seeks for every index. Stops early if the stream ends before the last index.
+    """
+    frames = []
+    position = 0
+    for i, target in enumerate(indices):
+        if i > 0 and target == indices[i - 1] and frames:
+            frames.append(frames[-1])
+            continue
+
+        gap = target - position
+        if gap < 0 or (seek_threshold is not None and gap >= max(seek_threshold, 1)):
+            cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+            position = target
+        while position < target and cap.grab():
+            position += 1
+        ret, frame = cap.read()
+        position += 1
+        if not ret:
+            break
+        frames.append(frame)
+    return frames
+
+
+def _fourcc(cap) -> str:
+    code = int(cap.get(cv2.CAP_PROP_FOURCC))
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00") or "unknown"
+
+
+def benchmark(video_paths: List[Path], frames_per_clip: int = 32, repeats: int = 3) -> list:
+    """Median wall time per clip for seek-every-index, sequential grab and the hybrid sampler"""
+    strategies = {
+        "seek_every_index": 0,
+        "sequential_grab": None,
+        "hybrid": SEEK_THRESHOLD
+    }
+    results = []
+    for video_path in video_paths:
+        cap = cv2.VideoCapture(str(video_path))
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        codec = _fourcc(cap)
+        cap.release()
+        indices = sample_frame_indices(total, frames_per_clip)
+
+        row = {"file": str(video_path), "codec": codec, "frames": total, "sampled": frames_per_clip}
+        for name, threshold in strategies.items():
+            samples = []
+            for _ in range(repeats):
+                cap = cv2.VideoCapture(str(video_path))
+                start = time.perf_counter()
+                read_frames_at(cap, indices, seek_threshold=threshold)
+                samples.append((time.perf_counter() - start) * 1000)
+                cap.release()
+            row[f"{name}_ms"] = round(float(np.median(samples)), 2)
+        row["best"] = min(strategies, key=lambda name: row[f"{name}_ms"])
+        results.append(row)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Frame sampling helpers")
+    parser.add_argument("--benchmark", nargs="+", type=Path, metavar="VIDEO",
+                        help="Compare sampling strategies on these videos (ideally one per codec)")
+    parser.add_argument("--frames-per-clip", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    if args.benchmark:
+        print(json.dumps(benchmark(args.benchmark, args.frames_per_clip, args.repeats), indent=2))
+    else:
+        parser.print_help()
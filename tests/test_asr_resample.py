@@ -0,0 +1,43 @@
+"""
+16 kHz resampling of soundfile-decoded audio in run_asr_infer.py
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+SCRIPT = Path(__file__).resolve().parents[1] / "apps" / "backend" / "scripts" / "run_asr_infer.py"
+spec = importlib.util.spec_from_file_location("run_asr_infer", SCRIPT)
+run_asr_infer = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(run_asr_infer)
+
+
+def tone(freq: float, sr: int, seconds: float = 1.0) -> np.ndarray:
+    t = np.arange(int(sr * seconds)) / sr
+    return np.sin(2 * np.pi * freq * t).astype(np.float32)
+
+
+def rms(x: np.ndarray) -> float:
+    return float(np.sqrt(np.mean(np.square(x[len(x) // 10:-len(x) // 10]))))
+
+
+def test_speech_band_kept():
+    out = run_asr_infer._to_mono_16k(tone(1000, 48000), 48000)
+    assert out.dtype == np.float32 and len(out) == 16000
+    assert rms(out) == pytest.approx(rms(tone(1000, 16000)), rel=0.05)
+
+
+def test_content_above_nyquist_not_aliased():
+    # 12 kHz at 48 kHz would fold to 4 kHz if decimated without a low-pass filter
+    out = run_asr_infer._to_mono_16k(tone(12000, 48000), 48000)
+    assert rms(out) < 0.01
+
+
+def test_stereo_44k1_downmixed():
+    stereo = np.stack([tone(440, 44100), tone(440, 44100)], axis=1)
+    out = run_asr_infer._to_mono_16k(stereo, 44100)
+    assert out.ndim == 1 and len(out) == 16000
@@ -0,0 +1,51 @@
+"""
+StreamingSession: MediaRecorder webm continuation chunks get the recording's header
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+SCRIPT = Path(__file__).resolve().parents[1] / "apps" / "backend" / "scripts" / "run_asr_infer.py"
+spec = importlib.util.spec_from_file_location("run_asr_infer", SCRIPT)
+run_asr_infer = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(run_asr_infer)
+
+INIT_SEGMENT = run_asr_infer.EBML_MAGIC + b"ebml+segment+tracks"
+CLUSTER = run_asr_infer.WEBM_CLUSTER_ID
+
+
+def test_continuation_chunks_get_the_first_chunk_header():
+    session = run_asr_infer.StreamingSession()
+    first = INIT_SEGMENT + CLUSTER + b"cluster-1"
+
+    assert session.chunk_bytes(first) == first
+    assert session.chunk_bytes(CLUSTER + b"cluster-2") == INIT_SEGMENT + CLUSTER + b"cluster-2"
+    # No audio of the first chunk is decoded again
+    assert b"cluster-1" not in session.chunk_bytes(CLUSTER + b"cluster-3")
+    # A timeslice cut mid-Cluster: the demuxer skips to the next Cluster after the header
+    assert session.chunk_bytes(b"tail-of-cluster-3" + CLUSTER) == INIT_SEGMENT + b"tail-of-cluster-3" + CLUSTER
+
+
+def test_new_recording_replaces_the_header():
+    session = run_asr_infer.StreamingSession()
+    session.chunk_bytes(INIT_SEGMENT + CLUSTER + b"a")
+    restarted = run_asr_infer.EBML_MAGIC + b"new-tracks"
+
+    session.chunk_bytes(restarted + CLUSTER + b"b")
+
+    assert session.chunk_bytes(CLUSTER + b"c") == restarted + CLUSTER + b"c"
+
+
+def test_continuation_without_header_rejected():
+    with pytest.raises(ValueError, match="continuation chunk"):
+        run_asr_infer.StreamingSession().chunk_bytes(CLUSTER + b"cluster-2")
+
+
+def test_self_contained_chunks_pass_through():
+    session = run_asr_infer.StreamingSession()
+    wav = b"RIFF" + b"\x00" * 40
+    assert session.chunk_bytes(wav) == wav
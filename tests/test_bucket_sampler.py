@@ -0,0 +1,46 @@
+"""
+BucketBatchSampler over landmark sequence lengths
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("torch")
+
+MODULE = Path(__file__).resolve().parents[1] / "ml" / "training" / "datasets" / "sampler.py"
+spec = importlib.util.spec_from_file_location("bucket_sampler", MODULE)
+sampler_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(sampler_module)
+
+LENGTHS = np.random.default_rng(0).integers(20, 300, size=257).tolist()
+
+
+def test_every_sample_once_per_epoch():
+    sampler = sampler_module.BucketBatchSampler(LENGTHS, batch_size=16, num_buckets=8)
+    for epoch in range(2):
+        sampler.set_epoch(epoch)
+        seen = sorted(i for batch in sampler for i in batch)
+        assert seen == list(range(len(LENGTHS)))
+
+
+def test_max_tokens_caps_padded_batch():
+    sampler = sampler_module.BucketBatchSampler(LENGTHS, max_tokens=1200, num_buckets=8)
+    for batch in sampler:
+        assert len(batch) == 1 or len(batch) * max(LENGTHS[i] for i in batch) <= 1200
+
+
+def test_bucketing_reduces_padding():
+    bucketed = sampler_module.BucketBatchSampler(LENGTHS, batch_size=16, num_buckets=8)
+    unbucketed = sampler_module.BucketBatchSampler(LENGTHS, batch_size=16, num_buckets=1)
+    assert bucketed.padding_stats()["padding_waste"] < unbucketed.padding_stats()["padding_waste"]
+
+
+def test_dataset_without_lengths_is_rejected():
+    class FixedClipVideoDataset:
+        pass
+
+    with pytest.raises(ValueError, match="lengths"):
+        sampler_module.dataset_lengths(FixedClipVideoDataset())
@@ -0,0 +1,52 @@
+"""
+Training, preprocessing and serving sample the same frames of a clip
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+ROOT = Path(__file__).resolve().parents[1]
+CASES = [(1, 8), (5, 8), (8, 8), (9, 8), (33, 32), (100, 16), (301, 32), (1000, 7)]
+
+
+def load_module(name: str, path: Path, *requires: str):
+    for module in requires:
+        pytest.importorskip(module)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def training_rule():
+    return load_module("training_transforms", ROOT / "ml" / "training" / "datasets" / "transforms.py",
+                       "torch", "torchvision").uniform_frame_indices
+
+
+def preprocessing_rule():
+    sys.path.insert(0, str(ROOT / "scripts"))
+    return load_module("video_sampling", ROOT / "scripts" / "video_sampling.py", "cv2").sample_frame_indices
+
+
+def serving_rule():
+    return load_module("run_pytorch_infer", ROOT / "apps" / "backend" / "scripts" / "run_pytorch_infer.py",
+                       "torch").sample_frame_indices
+
+
+@pytest.mark.parametrize("rule", [training_rule, preprocessing_rule, serving_rule])
+def test_uniform_sampling_rule(rule):
+    sample = rule()
+    for total, clip_len in CASES:
+        indices = np.asarray(sample(total, clip_len))
+        assert len(indices) == clip_len
+        assert indices[0] == 0 and indices[-1] == total - 1
+        np.testing.assert_array_equal(indices, np.maximum.accumulate(indices))
+        if total > clip_len:
+            np.testing.assert_array_equal(indices, np.linspace(0, total - 1, clip_len, dtype=int))
+        else:
+            np.testing.assert_array_equal(indices, list(range(total)) + [total - 1] * (clip_len - total))
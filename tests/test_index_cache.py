@@ -0,0 +1,71 @@
+"""
+Dataset index cache: location, invalidation and class-directory scans
+"""
+
+import importlib.util
+import os
+from pathlib import Path
+
+MODULE = Path(__file__).resolve().parents[1] / "ml" / "training" / "datasets" / "index_cache.py"
+spec = importlib.util.spec_from_file_location("index_cache", MODULE)
+index_cache = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(index_cache)
+
+
+def make_dataset(root: Path):
+    for label, names in {"hello": ["a.mp4", "b.avi"], "thanks": ["c.mp4"]}.items():
+        (root / label).mkdir(parents=True)
+        for name in names:
+            (root / label / name).write_bytes(b"not a real video")
+
+
+def build_counter(root: Path):
+    calls = []
+
+    def build():
+        calls.append(1)
+        return index_cache.scan_class_directories(root, ("*.mp4", "*.avi"))
+    return build, calls
+
+
+def test_cache_lives_under_dataset_root(tmp_path):
+    make_dataset(tmp_path)
+    build, calls = build_counter(tmp_path)
+    key = {"root": str(tmp_path)}
+
+    first = index_cache.cached_index("demo", key, build, dataset_root=tmp_path)
+    second = index_cache.cached_index("demo", key, build, dataset_root=tmp_path)
+
+    assert calls == [1]
+    assert first == second
+    assert len(list((tmp_path / ".index_cache").glob("demo_*.json"))) == 1
+    # The cache directory is not mistaken for a class
+    assert first["labels"] == ["hello", "thanks"]
+    # Indexing lists files only; nothing is probed
+    assert sorted(Path(entry["video"]).name for entry in first["samples"]) == ["a.mp4", "b.avi", "c.mp4"]
+    assert all(set(entry) == {"video", "gloss"} for entry in first["samples"])
+
+
+def test_new_clip_invalidates_index(tmp_path):
+    make_dataset(tmp_path)
+    build, calls = build_counter(tmp_path)
+    key = {"root": str(tmp_path)}
+    index_cache.cached_index("demo", key, build, dataset_root=tmp_path)
+
+    new_clip = tmp_path / "thanks" / "d.mp4"
+    new_clip.write_bytes(b"")
+    stat = (tmp_path / "thanks").stat()
+    os.utime(tmp_path / "thanks", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    index = index_cache.cached_index("demo", key, build, dataset_root=tmp_path)
+    assert calls == [1, 1]
+    assert len(index["samples"]) == 4
+
+
+def test_explicit_cache_dir(tmp_path):
+    make_dataset(tmp_path / "data")
+    build, _ = build_counter(tmp_path / "data")
+    index_cache.cached_index("demo", {"k": 1}, build, cache_dir=tmp_path / "run" / "index", dataset_root=tmp_path / "data")
+
+    assert list((tmp_path / "run" / "index").glob("demo_*.json"))
+    assert not (tmp_path / "data" / ".index_cache").exists()
@@ -0,0 +1,97 @@
+"""
+InferenceRouter latency accounting and in-flight bounds, with in-process fake backends
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("requests")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "apps" / "backend" / "server" / "inference"))
+
+from inference_router import Backend, InferenceRouter  # noqa: E402
+
+
+def blocking_call(release: threading.Event, label: str):
+    def call(clip_path):
+        release.wait(5)
+        return {"label": label, "confidence": 1.0}
+    return call
+
+
+def fast_call(label: str):
+    return lambda clip_path: {"label": label, "confidence": 1.0}
+
+
+def wait_until(predicate, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def test_timeout_recorded_at_timeout_value():
+    release = threading.Event()
+    slow = Backend("slow", blocking_call(release, "late"), timeout=0.05)
+    router = InferenceRouter([slow])
+    try:
+        with pytest.raises(RuntimeError, match="timed out after 0.05s"):
+            asyncio.run(router.infer("clip.mp4"))
+
+        assert list(slow.latencies) == [0.05]
+        assert (slow.failures, slow.timeouts, slow.in_flight) == (1, 1, 1)
+
+        # The abandoned call holds its slot until it returns, and is not recorded twice
+        release.set()
+        wait_until(lambda: slow.in_flight == 0)
+        assert (slow.successes, slow.failures, len(slow.latencies)) == (0, 1, 1)
+    finally:
+        release.set()
+        router.close()
+
+
+def test_saturated_backend_is_skipped():
+    release = threading.Event()
+    slow = Backend("slow", blocking_call(release, "late"), timeout=0.05, max_in_flight=1)
+    fallback = Backend("fallback", fast_call("ok"))
+    router = InferenceRouter([slow, fallback])
+    try:
+        first = asyncio.run(router.infer("clip.mp4"))
+        assert first["details"]["backend"] == "fallback"
+        assert slow.in_flight == 1
+
+        calls_before = slow.failures
+        second = asyncio.run(router.infer("clip.mp4"))
+        assert second["details"]["backend"] == "fallback"
+        # Skipped without another call or a breaker failure
+        assert slow.failures == calls_before and slow.in_flight == 1
+    finally:
+        release.set()
+        router.close()
+
+
+def test_hedge_loser_latency_recorded():
+    release = threading.Event()
+    primary = Backend("primary", blocking_call(release, "primary"), timeout=5.0)
+    primary.latencies.extend([0.01] * 20)
+    secondary = Backend("secondary", fast_call("secondary"))
+    router = InferenceRouter([primary, secondary], hedge=True)
+    try:
+        result = asyncio.run(router.infer("clip.mp4"))
+        assert result["details"]["backend"] == "secondary" and result["details"]["hedged"]
+        assert primary.successes == 0 and primary.in_flight == 1
+
+        release.set()
+        wait_until(lambda: primary.in_flight == 0)
+        assert primary.successes == 1 and len(primary.latencies) == 21
+        assert primary.latencies[-1] > 0.01
+        assert router.stats()["primary"]["in_flight"] == 0
+    finally:
+        release.set()
+        router.close()
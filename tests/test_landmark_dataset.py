@@ -0,0 +1,86 @@
+"""
+LandmarkDataset split selection for labels.csv layouts and sliding windows
+"""
+
+import csv
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("torch")
+pytest.importorskip("cv2")
+pytest.importorskip("PIL")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "ml"))
+
+from training.datasets.landmarks import LandmarkDataset, landmark_windows  # noqa: E402
+
+
+def write_clips(root: Path, rows):
+    """rows: (clip_id, class_name, split or None); writes clip dirs and root/labels.csv"""
+    fields = ["clip_id", "class_name", "clip_path"] + (["split"] if any(split for *_, split in rows) else [])
+    with open(root / "labels.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for clip_id, class_name, split in rows:
+            clip_dir = root / class_name / clip_id
+            clip_dir.mkdir(parents=True)
+            np.save(clip_dir / "landmarks.npy", np.zeros((6, 126), dtype=np.float32))
+            row = {"clip_id": clip_id, "class_name": class_name, "clip_path": str(clip_dir)}
+            if split:
+                row["split"] = split
+            writer.writerow(row)
+
+
+def test_labels_csv_filtered_by_split(tmp_path):
+    write_clips(tmp_path, [("a1", "a", "train"), ("b1", "b", "train"), ("a2", "a", "val")])
+
+    train = LandmarkDataset(str(tmp_path), split="train", features=["hands"])
+    val = LandmarkDataset(str(tmp_path), split="val", features=["hands"], label_to_idx=train.label_to_idx)
+
+    assert sorted(Path(s["path"]).parent.name for s in train.samples) == ["a1", "b1"]
+    assert [Path(s["path"]).parent.name for s in val.samples] == ["a2"]
+
+
+def test_labels_csv_without_split_raises(tmp_path):
+    write_clips(tmp_path, [("a1", "a", None), ("a2", "a", None)])
+
+    with pytest.raises(ValueError, match="split"):
+        LandmarkDataset(str(tmp_path), split="train", features=["hands"])
+
+
+def test_per_split_labels_csv(tmp_path):
+    for split, clip_id in [("train", "a1"), ("val", "a2")]:
+        (tmp_path / split).mkdir()
+        write_clips(tmp_path / split, [(clip_id, "a", None)])
+
+    assert [Path(s["path"]).parent.name for s in LandmarkDataset(str(tmp_path), split="val").samples] == ["a2"]
+
+
+@pytest.mark.parametrize("length,window,stride", [(20, 8, 3), (16, 8, 8), (5, 8, 4)])
+def test_landmark_windows_are_memmap_views(tmp_path, length, window, stride):
+    np.save(tmp_path / "landmarks.npy", np.arange(length * 4 * 3, dtype=np.float32).reshape(length, 4, 3))
+    landmarks = np.load(tmp_path / "landmarks.npy", mmap_mode="r")
+
+    windows = landmark_windows(landmarks, window, stride)
+
+    starts = list(range(0, length - window + 1, stride)) or [0]
+    assert windows.shape[0] == len(starts)
+    for w, start in enumerate(starts):
+        np.testing.assert_array_equal(windows[w], landmarks[start:start + window])
+    assert np.shares_memory(windows, landmarks)
+
+
+def test_dataset_windows(tmp_path):
+    write_clips(tmp_path, [("a1", "a", "train")])
+    clip = np.random.default_rng(0).random((20, 126), dtype=np.float32)
+    np.save(tmp_path / "a" / "a1" / "landmarks.npy", clip)
+
+    dataset = LandmarkDataset(str(tmp_path), split="train", features=["hands"], window=8, stride=4)
+
+    assert len(dataset) == len(range(0, 20 - 8 + 1, 4))
+    assert dataset.lengths() == [8] * len(dataset)
+    for w, start in enumerate(range(0, 20 - 8 + 1, 4)):
+        np.testing.assert_allclose(dataset[w]["pose"].numpy(), clip[start:start + 8])
@@ -0,0 +1,136 @@
+"""
+MicroBatcher batching, fixed-batch fallback and forward timing (run_pytorch_infer --serve)
+"""
+
+import importlib.util
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("torch")
+
+SCRIPT = Path(__file__).resolve().parents[1] / "apps" / "backend" / "scripts" / "run_pytorch_infer.py"
+spec = importlib.util.spec_from_file_location("run_pytorch_infer", SCRIPT)
+run_pytorch_infer = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(run_pytorch_infer)
+
+
+class FakeRegistry:
+    model_type = "onnx"
+    model_path = "fake.onnx"
+
+    def __init__(self, batch_error=None, refresh_s=0.0, preprocess_barrier=None):
+        self.batch_error = batch_error
+        self.refresh_s = refresh_s
+        self.preprocess_barrier = preprocess_barrier
+        self.fixed_batch = False
+        self.batch_sizes = []
+        self.predict_times = []
+
+    def preprocess_clip(self, clip_path, num_frames=None, timings=None):
+        # Clip "i" is a one-row tensor of i, so every result can be traced back to its request
+        if self.preprocess_barrier is not None:
+            self.preprocess_barrier.wait(timeout=5)
+        return np.full((1, 2), int(clip_path), dtype=np.float32)
+
+    def refresh(self):
+        time.sleep(self.refresh_s)
+        return False
+
+    def predict(self, clip_tensor):
+        self.predict_times.append(time.perf_counter())
+        self.batch_sizes.append(len(clip_tensor))
+        if len(clip_tensor) > 1 and self.batch_error is not None:
+            raise self.batch_error
+        return [(f"Sign_{int(row)}", 0.5) for row in clip_tensor[:, 0]]
+
+
+def run_batch(registry, size=3):
+    results = []
+    batcher = run_pytorch_infer.MicroBatcher(registry, results.append)
+    try:
+        entries = [(i, np.full((1, 2), i, dtype=np.float32), {}, time.perf_counter()) for i in range(size)]
+        batcher._run_batch(entries)
+    finally:
+        batcher.close()
+    return sorted(results, key=lambda result: result["id"])
+
+
+def submit_concurrently(registry, num_requests, **batcher_kwargs):
+    """submit() request i from its own thread; returns (results by id, time the last submit returned)"""
+    results = []
+    done = threading.Event()
+
+    def emit(result):
+        results.append(result)
+        if len(results) == num_requests:
+            done.set()
+
+    batcher = run_pytorch_infer.MicroBatcher(registry, emit, preprocess_workers=num_requests, **batcher_kwargs)
+    try:
+        threads = [threading.Thread(target=batcher.submit, args=(i, str(i))) for i in range(num_requests)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        submitted = time.perf_counter()
+        assert done.wait(timeout=5)
+    finally:
+        batcher.close()
+    return {result["id"]: result for result in results}, submitted
+
+
+def test_concurrent_submits_share_one_forward():
+    registry = FakeRegistry(preprocess_barrier=threading.Barrier(6))
+    results, _ = submit_concurrently(registry, 6, max_batch_size=6, max_wait_us=2_000_000)
+
+    # A full batch is run as soon as it fills, without waiting out max_wait_us
+    assert registry.batch_sizes == [6]
+    assert sorted(results) == list(range(6))
+    assert all(results[i]["label"] == f"Sign_{i}" for i in range(6))
+    assert all(result["details"]["batch_size"] == 6 for result in results.values())
+
+
+def test_partial_batch_flushed_after_max_wait():
+    registry = FakeRegistry(preprocess_barrier=threading.Barrier(3))
+    results, submitted = submit_concurrently(registry, 3, max_batch_size=8, max_wait_us=100_000)
+
+    assert registry.batch_sizes == [3]
+    # The batcher kept waiting for more clips until the deadline, then ran the partial batch
+    assert registry.predict_times[0] - submitted >= 0.05
+    assert all(results[i]["label"] == f"Sign_{i}" for i in range(3))
+    assert all(result["details"]["batch_size"] == 3 for result in results.values())
+
+
+def test_batched_forward_excludes_refresh():
+    registry = FakeRegistry(refresh_s=0.05)
+    results = run_batch(registry)
+
+    assert registry.batch_sizes == [3]
+    assert [result["label"] for result in results] == ["Sign_0", "Sign_1", "Sign_2"]
+    assert all(result["details"]["batch_size"] == 3 for result in results)
+    assert all(result["details"]["timings"]["forward_ms"] < 50 for result in results)
+
+
+def test_fixed_batch_shape_error_falls_back_per_clip():
+    registry = FakeRegistry(RuntimeError("Got invalid dimensions for input: input for the following indices"))
+    results = run_batch(registry)
+
+    assert registry.batch_sizes == [3, 1, 1, 1]
+    assert registry.fixed_batch
+    assert [result["label"] for result in results] == ["Sign_0", "Sign_1", "Sign_2"]
+
+    # Remembered: the next batch goes straight to per-clip passes
+    run_batch(registry, size=2)
+    assert registry.batch_sizes[4:] == [1, 1]
+
+
+def test_other_errors_are_not_retried():
+    registry = FakeRegistry(RuntimeError("CUDA out of memory"))
+    results = run_batch(registry)
+
+    assert registry.batch_sizes == [3]
+    assert [result["error"] for result in results] == ["CUDA out of memory"] * 3
@@ -0,0 +1,161 @@
+"""
+End-to-end runs of the preprocessing scripts with --sharded
+
+MediaPipe is replaced by a fake package on PYTHONPATH that returns fixed
+landmarks, so only the scripts' own decode/store plumbing is exercised.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from landmark_store import LandmarkStore  # noqa: E402
+from preprocess_extract_frames_and_landmarks import load_landmark_windows  # noqa: E402
+
+FAKE_MEDIAPIPE = '''
+from types import SimpleNamespace
+
+
+def _landmarks(n, value):
+    return SimpleNamespace(landmark=[SimpleNamespace(x=value, y=value, z=0.0)] * n)
+
+
+class _Solution:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def reset(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class Holistic(_Solution):
+    def process(self, rgb):
+        return SimpleNamespace(
+            pose_landmarks=_landmarks(33, 0.25),
+            left_hand_landmarks=_landmarks(21, 0.5),
+            right_hand_landmarks=None,
+            face_landmarks=None
+        )
+
+
+class Hands(_Solution):
+    def process(self, rgb):
+        return SimpleNamespace(multi_hand_landmarks=[_landmarks(21, 0.5)])
+
+
+class Pose(_Solution):
+    def process(self, rgb):
+        return SimpleNamespace(pose_landmarks=_landmarks(33, 0.25))
+
+
+solutions = SimpleNamespace(
+    holistic=SimpleNamespace(Holistic=Holistic),
+    hands=SimpleNamespace(Hands=Hands),
+    pose=SimpleNamespace(Pose=Pose),
+    drawing_utils=None
+)
+'''
+
+
+def write_video(path: Path, num_frames: int, size=(64, 48)):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), 25.0, size)
+    assert writer.isOpened(), "OpenCV cannot write mp4v test videos"
+    for i in range(num_frames):
+        writer.write(np.full((size[1], size[0], 3), i * 4 % 256, dtype=np.uint8))
+    writer.release()
+
+
+def run_script(tmp_path: Path, name: str, *args: str) -> subprocess.CompletedProcess:
+    """Run a copy of scripts/<name> from tmp_path/scripts, so ROOT-relative paths land in tmp_path"""
+    scripts = tmp_path / "scripts"
+    if not scripts.exists():
+        shutil.copytree(SCRIPTS_DIR, scripts, ignore=shutil.ignore_patterns("__pycache__"))
+    fake = tmp_path / "fake_modules"
+    fake.mkdir(exist_ok=True)
+    (fake / "mediapipe.py").write_text(FAKE_MEDIAPIPE, encoding="utf-8")
+
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(fake), os.environ.get("PYTHONPATH", "")]))
+    result = subprocess.run(
+        [sys.executable, str(scripts / name), *args],
+        cwd=tmp_path, env=env, capture_output=True, text=True, timeout=300
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    return result
+
+
+def test_load_landmark_windows(tmp_path):
+    landmarks = np.random.default_rng(0).random((30, 543, 3), dtype=np.float32)
+    np.save(tmp_path / "landmarks.npy", landmarks)
+
+    windows = load_landmark_windows(tmp_path / "landmarks.npy", window=8, stride=5)
+
+    starts = range(0, 30 - 8 + 1, 5)
+    assert windows.shape == (len(starts), 8, 543, 3)
+    for w, start in enumerate(starts):
+        np.testing.assert_array_equal(windows[w], landmarks[start:start + 8])
+    # A view chain ending at the file's memmap: nothing was copied
+    base = windows
+    while base is not None and not isinstance(base, np.memmap):
+        base = base.base
+    assert isinstance(base, np.memmap) and np.shares_memory(windows, base)
+
+
+def test_holistic_preprocess_sharded(tmp_path):
+    write_video(tmp_path / "data" / "raw" / "demo" / "train" / "hello" / "clip_a.mp4", 12)
+    write_video(tmp_path / "data" / "raw" / "demo" / "val" / "thanks" / "clip_b.mp4", 7)
+
+    run_script(tmp_path, "preprocess_extract_frames_and_landmarks.py", "--sharded")
+
+    store = LandmarkStore(tmp_path / "data" / "processed" / "landmark_store")
+    entries = {entry["clip_id"]: entry for entry in store.entries}
+    assert set(entries) == {"clip_a", "clip_b"}
+    assert (entries["clip_a"]["split"], entries["clip_a"]["class_name"]) == ("train", "hello")
+    assert (entries["clip_b"]["split"], entries["clip_b"]["class_name"]) == ("val", "thanks")
+
+    clip = store.get("clip_a")
+    assert clip.shape == (12, 543, 3)
+    assert np.allclose(clip[:, :33], [0.25, 0.25, 0.0]) and np.allclose(clip[:, 33:54], [0.5, 0.5, 0.0])
+    assert np.allclose(clip[:, 54:], 0.0)
+    np.testing.assert_array_equal(clip, np.load(tmp_path / "data" / "processed" / "train" / "hello" / "clip_a" / "landmarks.npy"))
+
+    # Rerun: every video is up to date, the store is still packed from the per-clip tree
+    result = run_script(tmp_path, "preprocess_extract_frames_and_landmarks.py", "--sharded")
+    assert "Processed 0 videos" in result.stdout
+    assert len(LandmarkStore(tmp_path / "data" / "processed" / "landmark_store")) == 2
+
+
+def test_dataset_clips_preprocess_sharded(tmp_path):
+    pytest.importorskip("pandas")
+    pytest.importorskip("tqdm")
+    for name, frames in [("hello", 40), ("thanks", 20)]:
+        write_video(tmp_path / "raw" / name / f"{name}_01.mp4", frames)
+
+    run_script(
+        tmp_path, "preprocess_dataset_clips.py",
+        "--input-dir", str(tmp_path / "raw"),
+        "--output-dir", str(tmp_path / "processed"),
+        "--frames-per-clip", "8",
+        "--split", "train",
+        "--sharded"
+    )
+
+    store = LandmarkStore(tmp_path / "processed" / "train" / "landmark_store", split="train")
+    assert sorted(entry["clip_id"] for entry in store.entries) == ["hello_01", "thanks_01"]
+    clip = store.get("hello_01")
+    # Flattened (42 hand landmarks x 3): the first hand from the fake, the second zero-padded
+    assert clip.shape == (8, 126)
+    assert np.allclose(clip[:, :63], [0.5, 0.5, 0.0] * 21) and np.allclose(clip[:, 63:], 0.0)
@@ -0,0 +1,35 @@
+"""
+VideoPreprocess: augmentation is opt-in and never applied outside training
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("tqdm")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "ml"))
+
+from training.utils.train_loops import VideoPreprocess  # noqa: E402
+
+
+def uint8_batch():
+    return torch.randint(0, 256, (2, 3, 3, 8, 8), generator=torch.Generator().manual_seed(0), dtype=torch.uint8)
+
+
+def test_no_augmentation_by_default():
+    preprocess = VideoPreprocess().train()
+    video = uint8_batch()
+
+    torch.testing.assert_close(preprocess(video.clone()), preprocess(video.clone()))
+
+
+def test_augmentation_only_in_training():
+    preprocess = VideoPreprocess(augment=True)
+    video = uint8_batch()
+    plain = VideoPreprocess(augment=False)(video.clone())
+
+    assert not torch.allclose(preprocess.train()(video.clone()), plain)
+    torch.testing.assert_close(preprocess.eval()(video.clone()), plain)
@@ -0,0 +1,61 @@
+"""
+VideoTransform: the batched tensor path against the PIL pipeline, and the
+frame cache's resize size against transforms.Resize
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+torch = pytest.importorskip("torch")
+pytest.importorskip("torchvision")
+Image = pytest.importorskip("PIL.Image")
+
+DATASETS_DIR = Path(__file__).resolve().parents[1] / "ml" / "training" / "datasets"
+
+
+def load_module(name: str):
+    # By path: training.datasets.__init__ imports every dataset (cv2, ...)
+    spec = importlib.util.spec_from_file_location(name, DATASETS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+transforms = load_module("transforms")
+
+SHAPES = [(48, 80), (90, 36), (37, 53)]
+# PIL rounds resized pixels to uint8 and interpolate does not: allow 1.5 uint8 steps
+ATOL_UINT8 = 1
+ATOL_FLOAT = 1.5 / (255 * 0.224)
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+@pytest.mark.parametrize("center_crop", [True, False])
+def test_tensor_path_matches_pil(shape, center_crop):
+    frames = np.random.default_rng(0).integers(0, 256, (4, *shape, 3), dtype=np.uint8)
+
+    for output_uint8, atol in [(False, ATOL_FLOAT), (True, ATOL_UINT8)]:
+        transform = transforms.VideoTransform(resize=32, clip_len=4, center_crop=center_crop, output_uint8=output_uint8)
+        expected = transform([Image.fromarray(frame) for frame in frames])
+        actual = transform(frames)
+
+        assert actual.shape == expected.shape == (4, 3, 32, 32)
+        assert actual.dtype == expected.dtype
+        torch.testing.assert_close(actual.float(), expected.float(), atol=atol, rtol=0)
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_frame_cache_resize_matches_torchvision(shape):
+    pytest.importorskip("cv2")
+    from torchvision.transforms import Resize
+
+    frame_cache = load_module("frame_cache")
+    frame = np.zeros((*shape, 3), dtype=np.uint8)
+
+    resized = frame_cache.resize_short_side(frame, 32)
+
+    width, height = Resize(32)(Image.fromarray(frame)).size
+    assert resized.shape[:2] == (height, width)
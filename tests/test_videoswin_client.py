@@ -0,0 +1,157 @@
+"""
+Triton binary tensor protocol of the Video-Swin client, against a stub HTTP session
+"""
+
+import json
+import struct
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("requests")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "apps" / "backend" / "server" / "inference"))
+
+import videoswin_client  # noqa: E402
+from videoswin_client import (  # noqa: E402
+    TritonClient,
+    decode_binary_response,
+    encode_binary_request,
+    parse_binary_response
+)
+
+
+class StubResponse:
+    def __init__(self, content: bytes, headers: dict):
+        self.content = content
+        self.headers = headers
+
+    def raise_for_status(self):
+        pass
+
+
+class StubTritonSession:
+    """Minimal Triton v2 HTTP endpoint: parses binary requests, answers with binary outputs"""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.requests = []
+
+    def post(self, url, data, headers, timeout):
+        header_length = int(headers["Inference-Header-Content-Length"])
+        request = json.loads(data[:header_length])
+        tensors = {}
+        offset = header_length
+        for spec in request["inputs"]:
+            size = spec["parameters"]["binary_data_size"]
+            tensors[spec["name"]] = data[offset:offset + size]
+            offset += size
+        assert offset == len(data)
+        self.requests.append({"url": url, "headers": headers, "header": request, "tensors": tensors})
+
+        outputs, blobs = [], []
+        for name, datatype, shape, blob in self.respond(request, tensors):
+            outputs.append({"name": name, "datatype": datatype, "shape": shape,
+                            "parameters": {"binary_data_size": len(blob)}})
+            blobs.append(blob)
+        header = json.dumps({"model_name": "videoswin", "model_version": "3", "outputs": outputs}).encode("utf-8")
+        return StubResponse(header + b"".join(blobs), {"Inference-Header-Content-Length": str(len(header))})
+
+    def close(self):
+        pass
+
+
+def make_client(respond, **kwargs) -> TritonClient:
+    client = TritonClient("http://triton:8000", **kwargs)
+    client.session = StubTritonSession(respond)
+    return client
+
+
+def test_encode_binary_request_header_and_payload():
+    tensor = np.arange(24, dtype=np.float32).reshape(1, 2, 3, 4)
+    body, header_length = encode_binary_request(
+        [("input", "FP32", tensor.shape, tensor), ("VIDEO", "BYTES", [2], [b"abc", "de"])],
+        ["output"]
+    )
+
+    header = json.loads(body[:header_length])
+    assert body[header_length - 1:header_length] == b"}"
+    assert [spec["name"] for spec in header["inputs"]] == ["input", "VIDEO"]
+    assert header["inputs"][0]["shape"] == [1, 2, 3, 4]
+    assert header["inputs"][0]["parameters"]["binary_data_size"] == tensor.nbytes
+    assert header["outputs"] == [{"name": "output", "parameters": {"binary_data": True}}]
+
+    payload = body[header_length:]
+    assert payload[:tensor.nbytes] == tensor.tobytes()
+    assert payload[tensor.nbytes:] == struct.pack("<I", 3) + b"abc" + struct.pack("<I", 2) + b"de"
+    assert len(payload) == sum(spec["parameters"]["binary_data_size"] for spec in header["inputs"])
+
+
+def test_decode_plain_json_response():
+    body = json.dumps({
+        "model_name": "videoswin",
+        "model_version": "1",
+        "outputs": [{"name": "CONFIDENCE", "datatype": "FP32", "shape": [1, 1], "data": [0.75]}]
+    }).encode("utf-8")
+
+    header, outputs = parse_binary_response(body, None)
+    assert header["model_version"] == "1" and "data" not in header["outputs"][0]
+    assert outputs["CONFIDENCE"].shape == (1, 1) and outputs["CONFIDENCE"].dtype == np.float32
+    assert decode_binary_response(body, None)["CONFIDENCE"][0, 0] == pytest.approx(0.75)
+
+
+def test_infer_tensor_round_trip():
+    clip = np.random.default_rng(0).random((1, 4, 3, 8, 8), dtype=np.float32)
+
+    def respond(request, tensors):
+        spec = request["inputs"][0]
+        received = np.frombuffer(tensors[spec["name"]], dtype=np.float32).reshape(spec["shape"])
+        np.testing.assert_array_equal(received, clip)
+        logits = np.array([[0.0, received.sum(), 1.0]], dtype=np.float32)
+        return [("output", "FP32", [1, 3], logits.tobytes())]
+
+    client = make_client(respond, class_names=["a", "b", "c"])
+    result = client.infer_tensor(clip)
+
+    sent = client.session.requests[0]
+    assert sent["url"] == "http://triton:8000/v2/models/videoswin/infer"
+    assert sent["headers"]["Content-Type"] == "application/octet-stream"
+    assert result["label"] == "b"
+    assert result["model"] == "videoswin-triton"
+    details = result["details"]
+    assert details["model_name"] == "videoswin" and details["model_version"] == "3"
+    assert [(o["name"], o["shape"]) for o in details["outputs"]] == [("output", [1, 3])]
+    assert details["logits_shape"] == [1, 3]
+
+
+def test_infer_clip_sends_raw_bytes(tmp_path):
+    clip_bytes = bytes(range(256)) * 3
+    clip_path = tmp_path / "clip.mp4"
+    clip_path.write_bytes(clip_bytes)
+
+    def respond(request, tensors):
+        assert request["inputs"][0]["datatype"] == "BYTES"
+        assert tensors["VIDEO"] == struct.pack("<I", len(clip_bytes)) + clip_bytes
+        label = "hello".encode("utf-8")
+        return [
+            ("LABEL", "BYTES", [1], struct.pack("<I", len(label)) + label),
+            ("CONFIDENCE", "FP32", [1], np.array([0.5], dtype=np.float32).tobytes())
+        ]
+
+    client = make_client(respond)
+    result = client.infer_clip(str(clip_path))
+
+    assert result["label"] == "hello"
+    assert result["confidence"] == pytest.approx(0.5)
+    assert [(o["name"], o["shape"]) for o in result["details"]["outputs"]] == [("LABEL", [1]), ("CONFIDENCE", [1])]
+    assert result["details"]["model_version"] == "3"
+
+
+def test_triton_client_reused_per_server():
+    videoswin_client._CLIENTS.clear()
+    first = videoswin_client.get_triton_client("http://triton:8000")
+    assert videoswin_client.get_triton_client("http://triton:8000") is first
+    assert videoswin_client.get_triton_client("http://triton:8000", "other") is not first
+    videoswin_client._CLIENTS.clear()